@@ -33,7 +33,9 @@ SSD的解釈:
 import numpy as np
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
+
+from ssd_numba_compat import njit  # Numba未導入環境ではPython実装のまま実行
 
 
 class SSDDomain(Enum):
@@ -258,6 +260,138 @@ class SSDCoreEngineV3_5:
         self.time = 0.0
 
 
+# ========== 複数エンジンの一括ステップ ==========
+@njit(cache=True)
+def step_all(E_d, E_i, kappa, p_norm, gamma_i2d, gamma_d2i, beta_decay,
+             Theta_critical, multiplier, G0, g, alpha, is_critical,
+             phase_count, flows, dt):
+    """
+    SSDCoreEngineV3_5.stepと同じ連成方程式を複数の状態についてまとめて積分
+    
+    接触圧なし・間接作用ON・増幅率1.0・相転移ONの場合に特化（呼び出し条件は
+    step_batchedが supports_step_all で確認する）。配列はin-placeで更新し、
+    flows[k] = [dE_direct, dE_indirect, conversion_i2d, conversion_d2i, decay] を書き込む。
+    """
+    for k in range(E_d.shape[0]):
+        G = G0[k] + g[k] * kappa[k]
+        
+        # 間接作用からのエネルギー生成（直接作用は接触圧なしのため0）
+        j_indirect = G * kappa[k] * 0.5
+        E_indirect_production = alpha[k] * max(0.0, p_norm[k] - j_indirect)
+        
+        # 連成項・減衰項
+        conversion_i2d = gamma_i2d[k] * E_i[k]
+        conversion_d2i = gamma_d2i[k] * E_d[k]
+        decay = beta_decay[k] * E_i[k]
+        
+        # 社会的臨界チェック
+        if E_i[k] < Theta_critical[k] and not is_critical[k]:
+            gamma_i2d[k] *= multiplier[k]
+            is_critical[k] = True
+            phase_count[k] += 1
+        elif E_i[k] >= Theta_critical[k] and is_critical[k]:
+            gamma_i2d[k] /= multiplier[k]
+            is_critical[k] = False
+        
+        dE_direct = 0.0 + conversion_i2d - conversion_d2i
+        dE_indirect = E_indirect_production - conversion_i2d + conversion_d2i - decay
+        
+        E_d[k] = max(0.0, E_d[k] + dE_direct * dt)
+        E_i[k] = max(0.0, E_i[k] + dE_indirect * dt)
+        
+        flows[k, 0] = dE_direct
+        flows[k, 1] = dE_indirect
+        flows[k, 2] = conversion_i2d
+        flows[k, 3] = conversion_d2i
+        flows[k, 4] = decay
+
+
+def supports_step_all(params: SSDParametersV3_5) -> bool:
+    """step_allで積分できるパラメータか（間接作用ON・増幅率1.0・相転移ON）"""
+    return (params.use_indirect_action and params.amplification_factor == 1.0
+            and params.enable_phase_transition)
+
+
+def step_batched(
+    engines: List[SSDCoreEngineV3_5],
+    states: List[SSDStateV3_5],
+    p_external: np.ndarray,
+    dt: float = 1.0
+) -> np.ndarray:
+    """
+    engines[k].step(states[k], [p_external[k], 0, 0], dt) を全エンジン分まとめて実行（接触圧なし）
+    
+    supports_step_allを満たすエンジンはstep_allで一括積分し、それ以外と
+    パラメータを共有するエンジン群（γ_i2dの増幅が逐次適用に依存）はengine.stepで逐次実行する。
+    
+    Returns:
+    --------
+    is_critical: np.ndarray
+        各状態の臨界フラグ（bool, shape=(n,)）
+    """
+    n = len(states)
+    p_external = np.asarray(p_external, dtype=float)
+    params = [e.params for e in engines]
+    if len({id(pr) for pr in params}) < n:
+        batch = []
+    else:
+        batch = [k for k in range(n) if supports_step_all(params[k])]
+    is_critical = np.empty(n, dtype=np.bool_)
+    
+    if len(batch) < n:
+        in_batch = set(batch)
+        for k in range(n):
+            if k not in in_batch:
+                engines[k].step(states[k], np.array([p_external[k], 0.0, 0.0]), dt)
+                is_critical[k] = states[k].is_critical
+    if not batch:
+        return is_critical
+    
+    m = len(batch)
+    b_states = [states[k] for k in batch]
+    b_params = [params[k] for k in batch]
+    E_d = np.fromiter((st.E_direct for st in b_states), float, m)
+    E_i = np.fromiter((st.E_indirect for st in b_states), float, m)
+    kappa = np.fromiter((st.kappa for st in b_states), float, m)
+    crit = np.fromiter((st.is_critical for st in b_states), np.bool_, m)
+    phase_count = np.fromiter((st.phase_transition_count for st in b_states), np.int64, m)
+    gamma_i2d = np.fromiter((pr.gamma_i2d for pr in b_params), float, m)
+    flows = np.empty((m, 5))
+    
+    step_all(
+        E_d, E_i, kappa, np.abs(p_external[batch]), gamma_i2d,
+        np.fromiter((pr.gamma_d2i for pr in b_params), float, m),
+        np.fromiter((pr.beta_decay for pr in b_params), float, m),
+        np.fromiter((pr.Theta_critical for pr in b_params), float, m),
+        np.fromiter((pr.phase_transition_multiplier for pr in b_params), float, m),
+        np.fromiter((pr.G0 for pr in b_params), float, m),
+        np.fromiter((pr.g for pr in b_params), float, m),
+        np.fromiter((pr.alpha for pr in b_params), float, m),
+        crit, phase_count, flows, dt
+    )
+    
+    # 結果を各状態・エンジンへ書き戻し
+    for i, k in enumerate(batch):
+        state, engine = states[k], engines[k]
+        state.F_direct.fill(0.0)
+        state.p_indirect[:] = (p_external[k], 0.0, 0.0)  # 既存バッファへ上書き（毎ステップ確保しない）
+        state.E_direct = float(E_d[i])
+        state.E_indirect = float(E_i[i])
+        state.is_critical = bool(crit[i])
+        state.phase_transition_count = int(phase_count[i])
+        (state.E_direct_flow, state.E_indirect_flow, state.conversion_i2d,
+         state.conversion_d2i, state.decay_rate) = flows[i].tolist()
+        
+        engine.params.gamma_i2d = float(gamma_i2d[i])
+        engine.total_conversion_i2d += state.conversion_i2d * dt
+        engine.total_conversion_d2i += state.conversion_d2i * dt
+        engine.total_decay += state.decay_rate * dt
+        engine.time += dt
+        is_critical[k] = state.is_critical
+    
+    return is_critical
+
+
 def create_physics_params() -> SSDParametersV3_5:
     """物理系パラメータ (γ=0, 保存則)"""
     return SSDParametersV3_5(
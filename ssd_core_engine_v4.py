@@ -42,11 +42,16 @@ v4.0の革新:
 - 層間葛藤の解決を、E×κ×Rの多次元パワーバランスで決定可能
 """
 
+import math
+from operator import attrgetter
+
 import numpy as np
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Optional, Dict, List, Tuple
 
+from ssd_numba_compat import njit  # Numba未導入環境ではPython実装のまま実行
+
 
 class SSDDomain(Enum):
     """動作ドメイン"""
@@ -188,6 +193,164 @@ class SSDParametersV4:
     use_indirect_action: bool = True
 
 
+# ステップ計算カーネルに渡すパラメータ（並び順 = _step_kernelの prm の添字）
+_STEP_PARAM_FIELDS = (
+    'alpha_d', 'alpha_base', 'alpha_core', 'alpha_upper',
+    'eta_base', 'eta_core', 'eta_upper',
+    'rho_base', 'rho_core', 'rho_upper',
+    'lambda_base', 'lambda_core', 'lambda_upper',
+    'kappa_min_base', 'kappa_min_core', 'kappa_min_upper',
+    'gamma_base2d', 'gamma_core2d', 'gamma_upper2d',
+    'gamma_d2base', 'gamma_d2core', 'gamma_d2upper',
+    'Theta_base', 'Theta_core', 'Theta_upper',
+    'phase_transition_multiplier_base', 'phase_transition_multiplier_core',
+    'phase_transition_multiplier_upper',
+    'beta_base', 'beta_core', 'beta_upper',
+)
+_get_step_params = attrgetter(*_STEP_PARAM_FIELDS)
+
+
+@njit(cache=True)
+def _norm3(v):
+    """3次元ベクトルのノルム
+    
+    np.linalg.norm（BLASのdot積）とは加算順序が異なり、複数成分が非零のとき
+    最下位ビットで丸めが異なりうる。1成分のみ非零（v8の [p, 0, 0]）なら一致する。
+    """
+    return math.sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2])
+
+
+@njit(cache=True)
+def _step_kernel(E_direct, E_base, E_core, E_upper, kappa_base, kappa_core, kappa_upper,
+                 F_direct, p_base, p_core, p_upper, j_direct, j_base, j_core, j_upper,
+                 prm, enable_phase_transition, dt):
+    """
+    SSDCoreEngineV4.stepの数値計算部（層別反力・生産・κ学習・相転移・連成・減衰）
+    
+    反力 j_* はin-placeで書き込み、更新後の値を次の順のタプルで返す:
+    (E_direct, E_base, E_core, E_upper, kappa_base, kappa_core, kappa_upper,
+     is_critical_base, is_critical_core, is_critical_upper,
+     dE_base, dE_core, dE_upper, dE_direct,
+     conversion_base2d, conversion_core2d, conversion_upper2d,
+     conversion_d2base, conversion_d2core, conversion_d2upper,
+     decay_base, decay_core, decay_upper)
+    """
+    (alpha_d, alpha_base, alpha_core, alpha_upper,
+     eta_base, eta_core, eta_upper,
+     rho_base, rho_core, rho_upper,
+     lambda_base, lambda_core, lambda_upper,
+     kappa_min_base, kappa_min_core, kappa_min_upper,
+     gamma_base2d, gamma_core2d, gamma_upper2d,
+     gamma_d2base, gamma_d2core, gamma_d2upper,
+     Theta_base, Theta_core, Theta_upper,
+     multiplier_base, multiplier_core, multiplier_upper,
+     beta_base, beta_core, beta_upper) = prm
+    
+    # 3. 層別反力の計算（整合作用）
+    for i in range(3):
+        j_direct[i] = kappa_base * F_direct[i]  # 物理は主にBASE層が反応
+        j_base[i] = kappa_base * p_base[i]
+        j_core[i] = kappa_core * p_core[i]
+        j_upper[i] = kappa_upper * p_upper[i]
+    
+    # 4. 層別エネルギー生産（圧力 - 反力の正部分）
+    E_direct_production = alpha_d * max(0.0, _norm3(F_direct) - _norm3(j_direct))
+    
+    p_base_mag = _norm3(p_base)
+    j_base_mag = _norm3(j_base)
+    E_base_production = alpha_base * max(0.0, p_base_mag - j_base_mag)
+    
+    p_core_mag = _norm3(p_core)
+    j_core_mag = _norm3(j_core)
+    E_core_production = alpha_core * max(0.0, p_core_mag - j_core_mag)
+    
+    p_upper_mag = _norm3(p_upper)
+    j_upper_mag = _norm3(j_upper)
+    E_upper_production = alpha_upper * max(0.0, p_upper_mag - j_upper_mag)
+    
+    # 5. 層別整合慣性の更新
+    dkappa_base = (eta_base * (p_base_mag * j_base_mag - rho_base * j_base_mag**2) -
+                   lambda_base * (kappa_base - kappa_min_base))
+    kappa_base = max(kappa_min_base, kappa_base + dkappa_base * dt)
+    
+    dkappa_core = (eta_core * (p_core_mag * j_core_mag - rho_core * j_core_mag**2) -
+                   lambda_core * (kappa_core - kappa_min_core))
+    kappa_core = max(kappa_min_core, kappa_core + dkappa_core * dt)
+    
+    dkappa_upper = (eta_upper * (p_upper_mag * j_upper_mag - rho_upper * j_upper_mag**2) -
+                    lambda_upper * (kappa_upper - kappa_min_upper))
+    kappa_upper = max(kappa_min_upper, kappa_upper + dkappa_upper * dt)
+    
+    # 6. 層別の相転移判定
+    is_critical_base = False
+    is_critical_core = False
+    is_critical_upper = False
+    if enable_phase_transition:
+        if E_base < Theta_base:
+            gamma_base2d *= multiplier_base
+            is_critical_base = True
+        if E_core < Theta_core:
+            gamma_core2d *= multiplier_core
+            is_critical_core = True
+        if E_upper < Theta_upper:
+            gamma_upper2d *= multiplier_upper
+            is_critical_upper = True
+    
+    # 7. 層別の連成変換
+    conversion_base2d = gamma_base2d * E_base
+    conversion_core2d = gamma_core2d * E_core
+    conversion_upper2d = gamma_upper2d * E_upper
+    conversion_d2base = gamma_d2base * E_direct
+    conversion_d2core = gamma_d2core * E_direct
+    conversion_d2upper = gamma_d2upper * E_direct
+    
+    # 8. 層別減衰
+    decay_base = beta_base * E_base
+    decay_core = beta_core * E_core
+    decay_upper = beta_upper * E_upper
+    
+    # 9. 層別エネルギー微分方程式
+    dE_base = E_base_production - conversion_base2d + conversion_d2base - decay_base
+    dE_core = E_core_production - conversion_core2d + conversion_d2core - decay_core
+    dE_upper = E_upper_production - conversion_upper2d + conversion_d2upper - decay_upper
+    dE_direct = (E_direct_production +
+                 conversion_base2d + conversion_core2d + conversion_upper2d -
+                 conversion_d2base - conversion_d2core - conversion_d2upper)
+    
+    # 10. エネルギー更新（負値防止）
+    E_base = max(0.0, E_base + dE_base * dt)
+    E_core = max(0.0, E_core + dE_core * dt)
+    E_upper = max(0.0, E_upper + dE_upper * dt)
+    E_direct = max(0.0, E_direct + dE_direct * dt)
+    
+    return (E_direct, E_base, E_core, E_upper, kappa_base, kappa_core, kappa_upper,
+            is_critical_base, is_critical_core, is_critical_upper,
+            dE_base, dE_core, dE_upper, dE_direct,
+            conversion_base2d, conversion_core2d, conversion_upper2d,
+            conversion_d2base, conversion_d2core, conversion_d2upper,
+            decay_base, decay_core, decay_upper)
+
+
+@njit(cache=True)
+def _step_batch_kernel(E, kappa, F, p, j, prm, enable_phase_transition, dt, critical, diag):
+    """
+    _step_kernelを複数の状態についてまとめて実行（配列はin-placeで更新）
+    
+    E[k] = [E_direct, E_base, E_core, E_upper], kappa[k] = [base, core, upper],
+    p[k] = 層別圧力ベクトル（BASE/CORE/UPPER）, j[k] = 反力（direct/base/core/upper）,
+    critical[k] = 臨界フラグ（BASE/CORE/UPPER）, diag[k] = _step_kernelの戻り値の11番目以降
+    """
+    for k in range(E.shape[0]):
+        (E[k, 0], E[k, 1], E[k, 2], E[k, 3], kappa[k, 0], kappa[k, 1], kappa[k, 2],
+         critical[k, 0], critical[k, 1], critical[k, 2],
+         diag[k, 0], diag[k, 1], diag[k, 2], diag[k, 3], diag[k, 4], diag[k, 5], diag[k, 6],
+         diag[k, 7], diag[k, 8], diag[k, 9], diag[k, 10], diag[k, 11], diag[k, 12]) = _step_kernel(
+            E[k, 0], E[k, 1], E[k, 2], E[k, 3], kappa[k, 0], kappa[k, 1], kappa[k, 2],
+            F[k], p[k, 0], p[k, 1], p[k, 2], j[k, 0], j[k, 1], j[k, 2], j[k, 3],
+            prm[k], enable_phase_transition[k], dt
+        )
+
+
 class SSDCoreEngineV4:
     """
     SSD Core Engine v4.0: 四層構造エネルギー・整合慣性分離版
@@ -260,139 +423,39 @@ class SSDCoreEngineV4:
         state.p_core = p_external_core.copy()
         state.p_upper = p_external_upper.copy()
         
-        # 3. 層別反力の計算（整合作用）
-        state.j_direct = state.kappa_base * state.F_direct  # 物理は主にBASE層が反応
-        state.j_base = state.kappa_base * state.p_base
-        state.j_core = state.kappa_core * state.p_core
-        state.j_upper = state.kappa_upper * state.p_upper
-        
-        # 4. 層別エネルギー生産（圧力 - 反力の正部分）
-        p_d_mag = np.linalg.norm(state.F_direct)
-        j_d_mag = np.linalg.norm(state.j_direct)
-        E_direct_production = self.params.alpha_d * max(0, p_d_mag - j_d_mag)
-        
-        p_base_mag = np.linalg.norm(state.p_base)
-        j_base_mag = np.linalg.norm(state.j_base)
-        E_base_production = self.params.alpha_base * max(0, p_base_mag - j_base_mag)
-        
-        p_core_mag = np.linalg.norm(state.p_core)
-        j_core_mag = np.linalg.norm(state.j_core)
-        E_core_production = self.params.alpha_core * max(0, p_core_mag - j_core_mag)
-        
-        p_upper_mag = np.linalg.norm(state.p_upper)
-        j_upper_mag = np.linalg.norm(state.j_upper)
-        E_upper_production = self.params.alpha_upper * max(0, p_upper_mag - j_upper_mag)
-        
-        # 5. 層別整合慣性の更新
-        dkappa_base = (self.params.eta_base * (p_base_mag * j_base_mag - self.params.rho_base * j_base_mag**2) -
-                       self.params.lambda_base * (state.kappa_base - self.params.kappa_min_base))
-        state.kappa_base += dkappa_base * dt
-        state.kappa_base = max(self.params.kappa_min_base, state.kappa_base)
-        
-        dkappa_core = (self.params.eta_core * (p_core_mag * j_core_mag - self.params.rho_core * j_core_mag**2) -
-                       self.params.lambda_core * (state.kappa_core - self.params.kappa_min_core))
-        state.kappa_core += dkappa_core * dt
-        state.kappa_core = max(self.params.kappa_min_core, state.kappa_core)
-        
-        dkappa_upper = (self.params.eta_upper * (p_upper_mag * j_upper_mag - self.params.rho_upper * j_upper_mag**2) -
-                        self.params.lambda_upper * (state.kappa_upper - self.params.kappa_min_upper))
-        state.kappa_upper += dkappa_upper * dt
-        state.kappa_upper = max(self.params.kappa_min_upper, state.kappa_upper)
-        
-        # 6. [v4核心機能] 層別の相転移判定
-        gamma_base2d = self.params.gamma_base2d
-        gamma_core2d = self.params.gamma_core2d
-        gamma_upper2d = self.params.gamma_upper2d
-        
-        state.is_critical_base = False
-        state.is_critical_core = False
-        state.is_critical_upper = False
-        
-        if self.params.enable_phase_transition:
-            # BASE層臨界判定
-            if state.E_base < self.params.Theta_base:
-                gamma_base2d *= self.params.phase_transition_multiplier_base
-                state.is_critical_base = True
-            
-            # CORE層臨界判定
-            if state.E_core < self.params.Theta_core:
-                gamma_core2d *= self.params.phase_transition_multiplier_core
-                state.is_critical_core = True
-            
-            # UPPER層臨界判定
-            if state.E_upper < self.params.Theta_upper:
-                gamma_upper2d *= self.params.phase_transition_multiplier_upper
-                state.is_critical_upper = True
-        
-        # 7. [v4核心機能] 層別の連成変換
-        # 間接→直接変換（各層から物理行動へ）
-        conversion_base2d = gamma_base2d * state.E_base
-        conversion_core2d = gamma_core2d * state.E_core
-        conversion_upper2d = gamma_upper2d * state.E_upper
-        
-        # 直接→間接変換（物理行動から各層へのフィードバック）
-        conversion_d2base = self.params.gamma_d2base * state.E_direct
-        conversion_d2core = self.params.gamma_d2core * state.E_direct
-        conversion_d2upper = self.params.gamma_d2upper * state.E_direct
-        
-        # 8. 層別減衰
-        decay_base = self.params.beta_base * state.E_base
-        decay_core = self.params.beta_core * state.E_core
-        decay_upper = self.params.beta_upper * state.E_upper
-        
-        # 9. [v4核心機能] 層別エネルギー微分方程式
-        # dE_base: 本能的不満の変化
-        dE_base = E_base_production - conversion_base2d + conversion_d2base - decay_base
-        
-        # dE_core: 規範的不満の変化
-        dE_core = E_core_production - conversion_core2d + conversion_d2core - decay_core
-        
-        # dE_upper: 理念的不満の変化
-        dE_upper = E_upper_production - conversion_upper2d + conversion_d2upper - decay_upper
-        
-        # dE_direct: 直接行動エネルギーの変化
-        dE_direct = (E_direct_production + 
-                     conversion_base2d + conversion_core2d + conversion_upper2d -
-                     conversion_d2base - conversion_d2core - conversion_d2upper)
-        
-        # 10. エネルギー更新
-        state.E_base += dE_base * dt
-        state.E_core += dE_core * dt
-        state.E_upper += dE_upper * dt
-        state.E_direct += dE_direct * dt
-        
-        # 負値防止
-        state.E_base = max(0.0, state.E_base)
-        state.E_core = max(0.0, state.E_core)
-        state.E_upper = max(0.0, state.E_upper)
-        state.E_direct = max(0.0, state.E_direct)
-        
-        # 11. 診断情報の記録
-        state.E_base_flow = dE_base
-        state.E_core_flow = dE_core
-        state.E_upper_flow = dE_upper
-        state.E_direct_flow = dE_direct
-        
-        state.conversion_base2d = conversion_base2d
-        state.conversion_core2d = conversion_core2d
-        state.conversion_upper2d = conversion_upper2d
-        state.conversion_d2base = conversion_d2base
-        state.conversion_d2core = conversion_d2core
-        state.conversion_d2upper = conversion_d2upper
+        # 3.〜10. 反力・エネルギー生産・κ学習・相転移・連成変換・減衰・エネルギー更新
+        (state.E_direct, state.E_base, state.E_core, state.E_upper,
+         state.kappa_base, state.kappa_core, state.kappa_upper,
+         state.is_critical_base, state.is_critical_core, state.is_critical_upper,
+         state.E_base_flow, state.E_core_flow, state.E_upper_flow, state.E_direct_flow,
+         state.conversion_base2d, state.conversion_core2d, state.conversion_upper2d,
+         state.conversion_d2base, state.conversion_d2core, state.conversion_d2upper,
+         decay_base, decay_core, decay_upper) = _step_kernel(
+            state.E_direct, state.E_base, state.E_core, state.E_upper,
+            state.kappa_base, state.kappa_core, state.kappa_upper,
+            state.F_direct, state.p_base, state.p_core, state.p_upper,
+            state.j_direct, state.j_base, state.j_core, state.j_upper,
+            _get_step_params(self.params), self.params.enable_phase_transition, dt
+        )
         
         # 12. 統計更新
-        self.total_conversion_base2d += conversion_base2d * dt
-        self.total_conversion_core2d += conversion_core2d * dt
-        self.total_conversion_upper2d += conversion_upper2d * dt
-        self.total_conversion_d2base += conversion_d2base * dt
-        self.total_conversion_d2core += conversion_d2core * dt
-        self.total_conversion_d2upper += conversion_d2upper * dt
+        self._accumulate_stats(state, decay_base, decay_core, decay_upper, dt)
+        
+        return state
+    
+    def _accumulate_stats(self, state: SSDStateV4, decay_base: float, decay_core: float,
+                          decay_upper: float, dt: float):
+        """1ステップ分の連成変換・減衰量と時刻を累積"""
+        self.total_conversion_base2d += state.conversion_base2d * dt
+        self.total_conversion_core2d += state.conversion_core2d * dt
+        self.total_conversion_upper2d += state.conversion_upper2d * dt
+        self.total_conversion_d2base += state.conversion_d2base * dt
+        self.total_conversion_d2core += state.conversion_d2core * dt
+        self.total_conversion_d2upper += state.conversion_d2upper * dt
         self.total_decay_base += decay_base * dt
         self.total_decay_core += decay_core * dt
         self.total_decay_upper += decay_upper * dt
         self.time += dt
-        
-        return state
     
     def get_total_energy(self, state: SSDStateV4) -> float:
         """総エネルギー"""
@@ -445,6 +508,61 @@ class SSDCoreEngineV4:
         }
 
 
+def step_batched(
+    engines: List[SSDCoreEngineV4],
+    states: List[SSDStateV4],
+    p_layers: np.ndarray,
+    dt: float
+) -> np.ndarray:
+    """
+    engines[k].step(states[k], *p_layers[k], dt) を全エンジン分まとめて実行（接触圧なし）
+    
+    Parameters:
+    -----------
+    engines: List[SSDCoreEngineV4]
+        各状態を更新するエンジン（統計はエンジンごとに累積）
+    states: List[SSDStateV4]
+        更新する状態（in-placeで更新）
+    p_layers: np.ndarray
+        層別外部圧力 shape=(n, 3, 3)（[状態, BASE/CORE/UPPER, 成分]）
+    dt: float
+        時間刻み
+        
+    Returns:
+    --------
+    critical: np.ndarray
+        臨界フラグ shape=(n, 3)（BASE/CORE/UPPER）
+    """
+    n = len(states)
+    E = np.array([(s.E_direct, s.E_base, s.E_core, s.E_upper) for s in states], dtype=float).reshape(n, 4)
+    kappa = np.array([(s.kappa_base, s.kappa_core, s.kappa_upper) for s in states], dtype=float).reshape(n, 3)
+    prm = np.array([_get_step_params(e.params) for e in engines], dtype=float).reshape(n, len(_STEP_PARAM_FIELDS))
+    enable = np.fromiter((e.params.enable_phase_transition for e in engines), np.bool_, n)
+    F = np.zeros((n, 3))
+    p = np.array(p_layers[:n], dtype=float)  # 呼び出し側のバッファと切り離す
+    j = np.empty((n, 4, 3))
+    critical = np.empty((n, 3), dtype=np.bool_)
+    diag = np.empty((n, 13))
+    
+    _step_batch_kernel(E, kappa, F, p, j, prm, enable, dt, critical, diag)
+    
+    # 結果を各状態・エンジンへ書き戻し
+    for k, (engine, state) in enumerate(zip(engines, states)):
+        state.F_direct = F[k]
+        state.p_base, state.p_core, state.p_upper = p[k]
+        state.j_direct, state.j_base, state.j_core, state.j_upper = j[k]
+        state.E_direct, state.E_base, state.E_core, state.E_upper = E[k].tolist()
+        state.kappa_base, state.kappa_core, state.kappa_upper = kappa[k].tolist()
+        state.is_critical_base, state.is_critical_core, state.is_critical_upper = critical[k].tolist()
+        (state.E_base_flow, state.E_core_flow, state.E_upper_flow, state.E_direct_flow,
+         state.conversion_base2d, state.conversion_core2d, state.conversion_upper2d,
+         state.conversion_d2base, state.conversion_d2core, state.conversion_d2upper,
+         decay_base, decay_core, decay_upper) = diag[k].tolist()
+        engine._accumulate_stats(state, decay_base, decay_core, decay_upper, dt)
+    
+    return critical
+
+
 # ========================================
 # デモ・テスト
 # ========================================
@@ -54,12 +54,42 @@ class SSDLayer(Enum):
     UPPER = auto()     # 上層:   理念、物語、時間圧 (意味/文脈, R=small)
 
 
+# 層の並び（集計配列のインデックス順）
+_LAYERS: Tuple[SSDLayer, ...] = tuple(SSDLayer)
+_LAYER_INDEX: Dict[SSDLayer, int] = {layer: i for i, layer in enumerate(_LAYERS)}
+_LAYER_BY_NAME: Dict[str, SSDLayer] = {layer.name: layer for layer in _LAYERS}
+
+
+def resolve_layer(layer) -> SSDLayer:
+    """層を本モジュールのSSDLayerへ解決
+    
+    他モジュールで定義された同名の層列挙（例: ssd_core_engine_v4.SSDLayer）は
+    メンバー名で対応付ける。対応する層がなければValueError。
+    """
+    if layer in _LAYER_INDEX:
+        return layer
+    resolved = _LAYER_BY_NAME.get(getattr(layer, 'name', None))
+    if resolved is None:
+        raise ValueError(f"Unknown SSDLayer: {layer!r}")
+    return resolved
+
+# 層間葛藤のペア（get_layer_conflict_arrayの並び）
+LAYER_CONFLICT_PAIRS: Tuple[Tuple[SSDLayer, SSDLayer], ...] = (
+    (SSDLayer.BASE, SSDLayer.UPPER),   # 本能 vs 理念
+    (SSDLayer.BASE, SSDLayer.CORE),    # 本能 vs 規範
+    (SSDLayer.CORE, SSDLayer.UPPER),   # 規範 vs 理念
+)
+LAYER_CONFLICT_LABELS: Tuple[str, ...] = tuple(f"{a.name}-{b.name}" for a, b in LAYER_CONFLICT_PAIRS)
+_CONFLICT_FIRST = np.array([_LAYER_INDEX[a] for a, _ in LAYER_CONFLICT_PAIRS])
+_CONFLICT_SECOND = np.array([_LAYER_INDEX[b] for _, b in LAYER_CONFLICT_PAIRS])
+
+
 @dataclass
 class PressureDimension:
     """意味圧の1つの次元 (四層構造対応)"""
     name: str                           # 次元名
     weight: float                       # 重み（影響度）
-    calculator: Callable                # 計算関数
+    calculator: Optional[Callable]      # 計算関数（Noneなら値のみの次元）
     layer: SSDLayer                     # [v2追加] 作用する構造層
     enabled: bool = True                # 有効/無効
     description: str = ""               # 説明
@@ -81,11 +111,14 @@ class MultiDimensionalPressure:
         self.layer_pressure_history: Dict[SSDLayer, List[float]] = {
             layer: [] for layer in SSDLayer
         }
+        # 集計用SoA（有効な次元のみ: 次元リスト / 層インデックス / 重み）。登録変更時に再構築
+        self._layout: Optional[Tuple[List[PressureDimension], np.ndarray, np.ndarray]] = None
+        self._last_pressures = np.zeros(len(_LAYERS))  # 最新の層別圧力
         
     def register_dimension(
         self, 
         name: str, 
-        calculator: Callable,
+        calculator: Optional[Callable],
         layer: SSDLayer,  # [v2追加] 必須パラメータに
         weight: float = 1.0,
         description: str = "",
@@ -98,8 +131,9 @@ class MultiDimensionalPressure:
         -----------
         name: str
             次元の名前
-        calculator: Callable[[dict], float]
-            圧力を計算する関数。contextを受け取り、圧力値を返す
+        calculator: Optional[Callable[[dict], float]]
+            圧力を計算する関数。contextを受け取り、圧力値を返す。
+            Noneなら値のみの次元（calculate_from_valuesで値を渡す。calculateでは集計から除外）
         layer: SSDLayer
             この圧力が作用する構造層 (PHYSICAL/BASE/CORE/UPPER)
         weight: float
@@ -113,26 +147,40 @@ class MultiDimensionalPressure:
             name=name,
             weight=weight,
             calculator=calculator,
-            layer=layer,  # [v2追加] 層を登録
+            layer=resolve_layer(layer),  # [v2追加] 層を登録
             enabled=enabled,
             description=description
         )
         self.dimensions[name] = dimension
+        self._layout = None
         
     def remove_dimension(self, name: str):
         """圧力次元を削除"""
         if name in self.dimensions:
             del self.dimensions[name]
+            self._layout = None
     
     def set_weight(self, name: str, weight: float):
         """次元の重みを変更"""
         if name in self.dimensions:
             self.dimensions[name].weight = weight
+            self._layout = None
     
     def enable_dimension(self, name: str, enabled: bool = True):
         """次元の有効/無効を切り替え"""
         if name in self.dimensions:
             self.dimensions[name].enabled = enabled
+            self._layout = None
+    
+    def _get_layout(self) -> Tuple[List[PressureDimension], np.ndarray, np.ndarray]:
+        """有効な次元の (次元リスト, 層インデックス配列, 重み配列) を返す（キャッシュ）"""
+        if self._layout is None:
+            dims = [d for d in self.dimensions.values() if d.enabled]
+            layer_ids = np.fromiter((_LAYER_INDEX[resolve_layer(d.layer)] for d in dims),
+                                    dtype=np.intp, count=len(dims))
+            weights = np.fromiter((d.weight for d in dims), dtype=np.float64, count=len(dims))
+            self._layout = (dims, layer_ids, weights)
+        return self._layout
     
     def calculate(self, context: dict) -> Dict[SSDLayer, float]:
         """
@@ -155,49 +203,83 @@ class MultiDimensionalPressure:
             例: {SSDLayer.BASE: 0.8, SSDLayer.CORE: 0.3, SSDLayer.UPPER: 0.5}
         """
         
-        # 各層ごとに圧力の合計と重みの合計を格納する
-        layer_pressures: Dict[SSDLayer, float] = {layer: 0.0 for layer in SSDLayer}
-        layer_weights: Dict[SSDLayer, float] = {layer: 0.0 for layer in SSDLayer}
+        dims, layer_ids, weights = self._get_layout()
+        values = np.zeros(len(dims))
+        ok = np.ones(len(dims), dtype=bool)
         
-        for name, dim in self.dimensions.items():
-            if not dim.enabled:
+        for k, dim in enumerate(dims):
+            if dim.calculator is None:
+                # 値のみの次元は計算できないため除外（重み0として扱う）
+                ok[k] = False
                 continue
-                
             try:
                 # 各次元の圧力を計算
                 pressure_value = dim.calculator(context)
                 
                 # 履歴に記録
                 dim.history.append(pressure_value)
-                
-                # 該当する層に、重み付けされた圧力と重みを加算
-                layer_pressures[dim.layer] += dim.weight * pressure_value
-                layer_weights[dim.layer] += dim.weight
+                values[k] = pressure_value
                 
             except Exception as e:
-                print(f"Warning: Failed to calculate pressure for {name}: {e}")
-                continue
+                print(f"Warning: Failed to calculate pressure for {dim.name}: {e}")
+                ok[k] = False
         
-        # 各層の最終的な圧力（重み付き平均）を計算
-        final_pressures: Dict[SSDLayer, float] = {}
-        for layer in SSDLayer:
-            total_w = layer_weights[layer]
-            if total_w > 0:
-                final_pressures[layer] = layer_pressures[layer] / total_w
-            else:
-                final_pressures[layer] = 0.0
+        return dict(zip(_LAYERS, self._aggregate(values, ok)))
+    
+    def calculate_from_values(self, values: np.ndarray, as_array: bool = False):
+        """
+        外部で計算済みの次元値から層別圧力を集計（calculateの計算関数呼び出しを省略）
+        
+        valuesは有効な次元の登録順に並んだ圧力値。複数プレイヤー分を
+        一括計算するカーネル等から渡すことを想定。戻り値・履歴はcalculateと同じ。
+        as_array=Trueなら辞書の代わりにSSDLayerの定義順の層別圧力配列を返す
+        （内部バッファのため次の計算で上書きされる）。
+        """
+        dims, _, _ = self._get_layout()
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (len(dims),):
+            raise ValueError(f"Expected {len(dims)} dimension values, got shape {values.shape}")
+        for dim, value in zip(dims, values.tolist()):
+            dim.history.append(value)
+        final_values = self._aggregate(values)
+        if as_array:
+            return self._last_pressures
+        return dict(zip(_LAYERS, final_values))
+    
+    def _aggregate(self, values: np.ndarray, ok: Optional[np.ndarray] = None) -> List[float]:
+        """次元値を層ごとの重み付き平均へ集計し履歴へ記録（戻り値: SSDLayerの定義順の層別圧力）
+        
+        okは計算に成功した次元のマスク（Noneなら全次元）。
+        """
+        _, layer_ids, weights = self._get_layout()
+        
+        # 層ごとに重み付き圧力と重みを一括集計（失敗した次元は重み0）
+        if ok is None:
+            w, ids = weights, layer_ids
+        else:
+            w = np.where(ok, weights, 0.0)
+            ids = np.where(ok, layer_ids, 0)
+        n_layers = len(_LAYERS)
+        layer_pressures = np.bincount(ids, weights=w * values, minlength=n_layers)
+        layer_weights = np.bincount(ids, weights=w, minlength=n_layers)
+        
+        # 各層の最終的な圧力（重み付き平均。重みのない層は0）
+        np.divide(layer_pressures, layer_weights, out=self._last_pressures,
+                  where=layer_weights > 0)
+        self._last_pressures[layer_weights <= 0] = 0.0
+        final_values = self._last_pressures.tolist()
         
         # 層ごとの履歴に記録
-        for layer in SSDLayer:
-            self.layer_pressure_history[layer].append(final_pressures[layer])
+        for layer, value in zip(_LAYERS, final_values):
+            self.layer_pressure_history[layer].append(value)
         
         # 総合圧（参考値）も計算
         # SSD理論的には「層ごとに異なる反応」が本質だが、
         # 全体の圧力レベルも参考情報として保持
-        total_pressure_all = sum(final_pressures.values())
+        total_pressure_all = sum(final_values)
         self.total_pressure_history.append(total_pressure_all)
         
-        return final_pressures
+        return final_values
     
     def get_dimension_info(self) -> Dict[str, dict]:
         """全次元の情報を取得 (層情報を含む)"""
@@ -248,31 +330,23 @@ class MultiDimensionalPressure:
             各層ペアの葛藤指数
             例: 'BASE-UPPER': 0.64 (両方とも0.8の圧力)
         """
-        if not self.layer_pressure_history[SSDLayer.BASE]:
-            return {}
-        
-        # 最新の各層圧力を取得
-        current_pressures = {
-            layer: self.layer_pressure_history[layer][-1] 
-            for layer in SSDLayer
-        }
-        
-        conflicts = {}
-        
-        # BASE-UPPER葛藤（本能 vs 理念）
-        conflicts['BASE-UPPER'] = current_pressures[SSDLayer.BASE] * current_pressures[SSDLayer.UPPER]
-        
-        # BASE-CORE葛藤（本能 vs 規範）
-        conflicts['BASE-CORE'] = current_pressures[SSDLayer.BASE] * current_pressures[SSDLayer.CORE]
-        
-        # CORE-UPPER葛藤（規範 vs 理念）
-        conflicts['CORE-UPPER'] = current_pressures[SSDLayer.CORE] * current_pressures[SSDLayer.UPPER]
+        conflicts = self.get_layer_conflict_array()
+        return dict(zip(LAYER_CONFLICT_LABELS, conflicts.tolist()))
+    
+    def get_layer_conflict_array(self) -> np.ndarray:
+        """
+        層間葛藤指数を配列で返す（並びはLAYER_CONFLICT_LABELS。未計算なら空配列）
         
-        # PHYSICAL圧が高い場合は全ての葛藤が無意味（物理制約が支配的）
-        physical_suppression = 1.0 - current_pressures[SSDLayer.PHYSICAL]
-        conflicts = {k: v * physical_suppression for k, v in conflicts.items()}
+        各ペアの圧力の積を、PHYSICAL圧で抑制したもの
+        （PHYSICAL圧が高い場合は物理制約が支配的で葛藤は無意味）。
+        最大の葛藤はnp.argmaxでLAYER_CONFLICT_LABELSの添字として得られる。
+        """
+        if not self.layer_pressure_history[SSDLayer.BASE]:
+            return np.zeros(0)
         
-        return conflicts
+        p = self._last_pressures
+        physical_suppression = 1.0 - p[_LAYER_INDEX[SSDLayer.PHYSICAL]]
+        return p[_CONFLICT_FIRST] * p[_CONFLICT_SECOND] * physical_suppression
     
     def get_dominant_layer(self) -> Tuple[SSDLayer, float]:
         """
@@ -286,13 +360,8 @@ class MultiDimensionalPressure:
         if not self.layer_pressure_history[SSDLayer.BASE]:
             return (SSDLayer.BASE, 0.0)
         
-        current_pressures = {
-            layer: self.layer_pressure_history[layer][-1] 
-            for layer in SSDLayer
-        }
-        
-        dominant_layer = max(current_pressures.items(), key=lambda x: x[1])
-        return dominant_layer
+        i = int(np.argmax(self._last_pressures))
+        return (_LAYERS[i], float(self._last_pressures[i]))
     
     def should_trigger_leap(self, threshold: float = 0.7) -> Optional[SSDLayer]:
         """
@@ -0,0 +1,24 @@
+"""
+Numba互換レイヤー
+
+Numbaが導入されていればその njit を、未導入環境では関数をそのまま返す
+代替デコレータを提供する（Python実装のまま実行）。
+
+使い方:
+    from ssd_numba_compat import njit
+
+    @njit(cache=True)
+    def kernel(...):
+        ...
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """numba.njitの代替（@njit / @njit(...) のどちらの書き方でも関数をそのまま返す）"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+__all__ = ['njit']
@@ -17,8 +17,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Dict, Tuple, Optional
 import random
+import sys
 import numpy as np
-import matplotlib.pyplot as plt
 
 # ========== SSD v3.5コアエンジン ==========
 class SSDv3_5:
@@ -215,6 +215,10 @@ class WerewolfPlayerV5:
 
 # ========== ゲームマスター（v5完全版） ==========
 class WerewolfGameV5:
+    # 可視化用Figure（スイープ実行時もプロセス内で1枚を使い回す）
+    _fig = None
+    _axes = None
+    
     def __init__(self):
         self.players: List[WerewolfPlayerV5] = []
         self.day = 0
@@ -685,8 +689,8 @@ class WerewolfGameV5:
             return "人狼側の勝利"
         return None
     
-    def run(self):
-        """ゲーム実行"""
+    def run(self, visualize: bool = True):
+        """ゲーム実行（visualize=Falseでグラフ生成を省略）"""
         self.setup_game()
         print("\n[ゲーム開始]")
         
@@ -707,7 +711,8 @@ class WerewolfGameV5:
                 break
         
         self.print_final_report()
-        self.visualize_v5()
+        if visualize:
+            self.visualize_v5()
     
     def print_final_report(self):
         """最終レポート"""
@@ -741,112 +746,111 @@ class WerewolfGameV5:
         print(f"  ペルソナ変異: {sum(p.persona_transitions for p in self.players)}回")
         print(f"  ルールブレイク: {self.total_rulebreaks}回")
     
+    @classmethod
+    def _get_figure(cls):
+        """可視化用Figure取得（初回のみ生成し、以降はAxesをクリアして再利用）
+        
+        plt.show()でウィンドウが閉じられる等で破棄済みのFigureは再利用せず作り直す。
+        """
+        import matplotlib.pyplot as plt
+        
+        if cls._fig is None or not plt.fignum_exists(cls._fig.number):
+            cls._fig, cls._axes = plt.subplots(3, 3, figsize=(18, 14))
+        else:
+            for ax in cls._axes.flat:
+                ax.cla()
+        return cls._fig, cls._axes
+    
     def visualize_v5(self):
         """可視化（v5拡張: 戦略・ペルソナ変異グラフ追加）"""
-        fig, axes = plt.subplots(3, 3, figsize=(18, 14))
+        # matplotlibは可視化時のみ読み込む（プログラムからの実行では不要）
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import to_rgba_array
+        
+        fig, axes = self._get_figure()
         fig.suptitle('SSD v5.0: Werewolf Game with Structural Leap', fontsize=16, fontweight='bold')
         
-        colors = plt.cm.tab10(np.linspace(0, 1, len(self.players)))
-        
-        # 既存グラフ (1-6)
-        for idx, player in enumerate(self.players):
-            axes[0, 0].plot(player.engine.history['E_direct'], 
-                          label=player.name, color=colors[idx], linewidth=2)
-        axes[0, 0].set_title('E_direct (行動エネルギー)', fontweight='bold')
-        axes[0, 0].set_xlabel('Time Step')
-        axes[0, 0].set_ylabel('Energy')
-        axes[0, 0].legend(loc='best', fontsize=8)
-        axes[0, 0].grid(True, alpha=0.3)
-        
-        for idx, player in enumerate(self.players):
-            axes[0, 1].plot(player.engine.history['E_indirect'], 
-                          label=player.name, color=colors[idx], linewidth=2)
-        axes[0, 1].set_title('E_indirect (思考エネルギー)', fontweight='bold')
-        axes[0, 1].set_xlabel('Time Step')
-        axes[0, 1].set_ylabel('Energy')
-        axes[0, 1].legend(loc='best', fontsize=8)
-        axes[0, 1].grid(True, alpha=0.3)
-        
-        for idx, player in enumerate(self.players):
-            axes[0, 2].plot(player.engine.history['Theta'], 
-                          label=player.name, color=colors[idx], linewidth=2)
-        axes[0, 2].set_title('Theta (総エネルギー)', fontweight='bold')
-        axes[0, 2].set_xlabel('Time Step')
-        axes[0, 2].set_ylabel('Energy')
-        axes[0, 2].legend(loc='best', fontsize=8)
-        axes[0, 2].grid(True, alpha=0.3)
-        
-        for idx, player in enumerate(self.players):
-            axes[1, 0].plot(player.engine.history['kappa'], 
-                          label=player.name, color=colors[idx], linewidth=2)
-        axes[1, 0].set_title('Kappa (整合慣性)', fontweight='bold')
-        axes[1, 0].set_xlabel('Time Step')
-        axes[1, 0].set_ylabel('Kappa')
-        axes[1, 0].legend(loc='best', fontsize=8)
-        axes[1, 0].grid(True, alpha=0.3)
-        
-        suspicion_data = [p.suspicion_level for p in self.players]
-        axes[1, 1].bar([p.name for p in self.players], suspicion_data, color=colors)
-        axes[1, 1].set_title('疑惑レベル (最終)', fontweight='bold')
-        axes[1, 1].set_ylabel('Suspicion Level')
-        axes[1, 1].tick_params(axis='x', rotation=45)
-        axes[1, 1].grid(True, alpha=0.3, axis='y')
-        
-        statement_data = [p.statement_count for p in self.players]
-        axes[1, 2].bar([p.name for p in self.players], statement_data, color=colors)
-        axes[1, 2].set_title('発言回数', fontweight='bold')
-        axes[1, 2].set_ylabel('Statements')
-        axes[1, 2].tick_params(axis='x', rotation=45)
-        axes[1, 2].grid(True, alpha=0.3, axis='y')
-        
-        # v5新規グラフ (7-9)
-        simulation_data = [p.simulations_performed for p in self.players]
-        axes[2, 0].bar([p.name for p in self.players], simulation_data, color=colors)
-        axes[2, 0].set_title('思考シミュレーション回数', fontweight='bold')
-        axes[2, 0].set_ylabel('Simulations')
-        axes[2, 0].tick_params(axis='x', rotation=45)
-        axes[2, 0].grid(True, alpha=0.3, axis='y')
-        
-        strategy_data = [len(p.strategies_used) for p in self.players]
-        axes[2, 1].bar([p.name for p in self.players], strategy_data, color=colors)
-        axes[2, 1].set_title('戦略参照回数', fontweight='bold')
-        axes[2, 1].set_ylabel('Strategy Uses')
-        axes[2, 1].tick_params(axis='x', rotation=45)
-        axes[2, 1].grid(True, alpha=0.3, axis='y')
-        
-        transition_data = [p.persona_transitions for p in self.players]
-        rulebreak_data = [p.rulebreaks_performed for p in self.players]
+        # (N, 4) RGBA配列を一度だけ作り、全サブプロットで共有
+        colors = to_rgba_array(plt.cm.tab10(np.linspace(0, 1, len(self.players))))
+        names = [p.name for p in self.players]
         x = np.arange(len(self.players))
         width = 0.35
+        
+        # 既存グラフ (1-4): (axes位置, history key, タイトル, y軸ラベル)
+        line_specs = [
+            ((0, 0), 'E_direct', 'E_direct (行動エネルギー)', 'Energy'),
+            ((0, 1), 'E_indirect', 'E_indirect (思考エネルギー)', 'Energy'),
+            ((0, 2), 'Theta', 'Theta (総エネルギー)', 'Energy'),
+            ((1, 0), 'kappa', 'Kappa (整合慣性)', 'Kappa'),
+        ]
+        for (r, c), key, title, ylabel in line_specs:
+            ax = axes[r, c]
+            for idx, player in enumerate(self.players):
+                ax.plot(player.engine.history[key], 
+                        label=player.name, color=colors[idx], linewidth=2)
+            ax.set_title(title, fontweight='bold')
+            ax.set_xlabel('Time Step')
+            ax.set_ylabel(ylabel)
+            ax.legend(loc='best', fontsize=8)
+            ax.grid(True, alpha=0.3)
+        
+        # 棒グラフ (5-8, v5新規含む): (axes位置, タイトル, y軸ラベル, データ)
+        bar_specs = [
+            ((1, 1), '疑惑レベル (最終)', 'Suspicion Level',
+             np.array([p.suspicion_level for p in self.players])),
+            ((1, 2), '発言回数', 'Statements',
+             np.array([p.statement_count for p in self.players])),
+            ((2, 0), '思考シミュレーション回数', 'Simulations',
+             np.array([p.simulations_performed for p in self.players])),
+            ((2, 1), '戦略参照回数', 'Strategy Uses',
+             np.array([len(p.strategies_used) for p in self.players])),
+        ]
+        for (r, c), title, ylabel, data in bar_specs:
+            ax = axes[r, c]
+            ax.bar(x, data, color=colors)
+            ax.set_title(title, fontweight='bold')
+            ax.set_ylabel(ylabel)
+        
+        # 構造的跳躍統計（グループ棒グラフのため個別処理）
+        transition_data = np.array([p.persona_transitions for p in self.players])
+        rulebreak_data = np.array([p.rulebreaks_performed for p in self.players])
         axes[2, 2].bar(x - width/2, transition_data, width, label='ペルソナ変異', color='skyblue')
         axes[2, 2].bar(x + width/2, rulebreak_data, width, label='ルールブレイク', color='salmon')
         axes[2, 2].set_title('構造的跳躍統計', fontweight='bold')
         axes[2, 2].set_ylabel('Count')
-        axes[2, 2].set_xticks(x)
-        axes[2, 2].set_xticklabels([p.name for p in self.players], rotation=45)
         axes[2, 2].legend()
-        axes[2, 2].grid(True, alpha=0.3, axis='y')
         
-        plt.tight_layout()
-        plt.savefig('ssd_werewolf_game_v5.png', dpi=150, bbox_inches='tight')
+        # 棒グラフ共通の目盛り・グリッド
+        for (r, c) in [spec[0] for spec in bar_specs] + [(2, 2)]:
+            axes[r, c].set_xticks(x)
+            axes[r, c].set_xticklabels(names, rotation=45)
+            axes[r, c].grid(True, alpha=0.3, axis='y')
+        
+        fig.tight_layout()
+        fig.savefig('ssd_werewolf_game_v5.png', dpi=150, bbox_inches='tight')
         print("\n💾 グラフ保存: ssd_werewolf_game_v5.png")
         plt.show()
 
 # ========== メイン実行 ==========
 if __name__ == "__main__":
     game = WerewolfGameV5()
-    game.run()
+    game.run(visualize="--no-plot" not in sys.argv)
     
-    print("\n" + "=" * 70)
-    print("✅ v5.0デモ完了")
-    print("=" * 70)
-    print("\n🎓 v5.0の構造的跳躍:")
-    print("  1. ✅ 動的ペルソナ → 上層構造の跳躍・変異")
-    print("  2. ✅ 戦略データベース → 中核構造への接続・参照")
-    print("  3. ✅ ルールブレイク → 物理層（ゲームルール）への攻撃")
-    print("  4. ✅ 四層構造の完全実装 → 反応機械から構造的思考者へ")
-    print("\n🔬 SSD理論の完全実証:")
-    print("  - 物理層（ルール） ← 攪乱型の跳躍で破壊可能")
-    print("  - 中核層（戦略DB） ← 思考フェーズで参照・実行")
-    print("  - 上層層（ペルソナ） ← 相転移で動的変異")
-    print("  - 基層（SSDエンジン） ← エネルギー整合性で全層を駆動")
+    sys.stdout.write("\n".join([
+        "",
+        "=" * 70,
+        "✅ v5.0デモ完了",
+        "=" * 70,
+        "",
+        "🎓 v5.0の構造的跳躍:",
+        "  1. ✅ 動的ペルソナ → 上層構造の跳躍・変異",
+        "  2. ✅ 戦略データベース → 中核構造への接続・参照",
+        "  3. ✅ ルールブレイク → 物理層（ゲームルール）への攻撃",
+        "  4. ✅ 四層構造の完全実装 → 反応機械から構造的思考者へ",
+        "",
+        "🔬 SSD理論の完全実証:",
+        "  - 物理層（ルール） ← 攪乱型の跳躍で破壊可能",
+        "  - 中核層（戦略DB） ← 思考フェーズで参照・実行",
+        "  - 上層層（ペルソナ） ← 相転移で動的変異",
+        "  - 基層（SSDエンジン） ← エネルギー整合性で全層を駆動",
+    ]) + "\n")
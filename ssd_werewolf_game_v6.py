@@ -14,10 +14,14 @@ SSD理論の完全実装:
 """
 
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import List, Dict, Tuple, Optional, Callable
+import itertools
+import os
 import random
+import sys
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 
 # ========== SSD v3.5コアエンジン（完全版）インポート ==========
@@ -25,14 +29,51 @@ from ssd_core_engine_v3_5 import (
     SSDCoreEngineV3_5,
     SSDStateV3_5,
     SSDParametersV3_5,
-    SSDDomain
+    SSDDomain,
+    step_batched
 )
 
-# ========== 多次元意味圧システム（完全版）インポート ==========
-from ssd_multidimensional_pressure import (
-    MultiDimensionalPressure,
-    PressureDimension
-)
+# ========== 乱数バッファ ==========
+class RandomBuffer:
+    """np.randomで一括生成した一様乱数[0, 1)を順に払い出す（ゲーム内の乱数呼び出し用）"""
+    
+    def __init__(self, block_size: int = 1024):
+        self.block_size = block_size
+        self._values: List[float] = []
+        self._pos = 0
+    
+    def random(self) -> float:
+        if self._pos >= len(self._values):
+            self._values = np.random.random(self.block_size).tolist()
+            self._pos = 0
+        value = self._values[self._pos]
+        self._pos += 1
+        return value
+    
+    def random_array(self, shape) -> np.ndarray:
+        """同じ乱数列から指定形状の一様乱数配列を払い出す（一括生成の置き換え用）"""
+        out = np.empty(shape)
+        flat = out.reshape(-1)
+        filled = 0
+        while filled < flat.size:
+            if self._pos >= len(self._values):
+                self._values = np.random.random(self.block_size).tolist()
+                self._pos = 0
+            take = min(flat.size - filled, len(self._values) - self._pos)
+            flat[filled:filled + take] = self._values[self._pos:self._pos + take]
+            filled += take
+            self._pos += take
+        return out
+    
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+    
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+# ========== 多次元意味圧の次元定義（SoA: W/S 行列の列順） ==========
+PRESSURE_DIMENSIONS = ('suspicion', 'social_suspicion', 'trust', 
+                       'information', 'time', 'boredom')
 
 # ========== v6新機能: ペルソナシステム（動的変異対応） ==========
 class Persona(Enum):
@@ -60,56 +101,141 @@ PERSONA_TRANSITIONS = [
     PersonaTransition(Persona.DISRUPTOR, Persona.STEALTH, 0.35, "静かになった"),
 ]
 
+# 変異元ペルソナ別の変異候補と確率テーブル（行=ペルソナ, 列=候補順, 余白は確率0）
+_PERSONA_INDEX = {persona: i for i, persona in enumerate(Persona)}
+_TRANSITIONS_FROM = [tuple(t for t in PERSONA_TRANSITIONS if t.from_persona == persona)
+                     for persona in Persona]
+_MAX_TRANSITIONS = max(len(ts) for ts in _TRANSITIONS_FROM)
+_TRANSITION_PROB = np.zeros((len(Persona), _MAX_TRANSITIONS))
+for _i, _ts in enumerate(_TRANSITIONS_FROM):
+    _TRANSITION_PROB[_i, :len(_ts)] = [t.probability for t in _ts]
+
+# ペルソナ別の主観的重み付け（import時に一度だけ構築）
+def _build_persona_weights(persona: Persona) -> Dict[str, float]:
+    weights = {
+        'suspicion': 1.0,
+        'social_suspicion': 1.0,
+        'trust': 1.0,
+        'information': 1.0,
+        'time': 1.0,
+        'boredom': 1.0
+    }
+    
+    if persona == Persona.AGGRESSIVE:
+        weights['social_suspicion'] = 1.5  # 他者の発言に過敏
+        weights['suspicion'] = 0.8
+    elif persona == Persona.STEALTH:
+        weights['suspicion'] = 1.5  # 自分が目立つことを恐れる
+        weights['social_suspicion'] = 0.7
+    elif persona == Persona.LEADER:
+        weights['trust'] = 1.3  # 信頼関係を重視
+        weights['information'] = 1.2
+    elif persona == Persona.DISRUPTOR:
+        weights['boredom'] = 1.5  # 退屈を強く感じる
+        weights['time'] = 0.6
+        
+    return weights
+
+_PERSONA_WEIGHTS: Dict[Persona, Dict[str, float]] = {
+    persona: _build_persona_weights(persona) for persona in Persona
+}
+# W行列に書き込む行（列順=PRESSURE_DIMENSIONS）
+_PERSONA_WEIGHT_ROWS: Dict[Persona, np.ndarray] = {
+    persona: np.array([weights[d] for d in PRESSURE_DIMENSIONS])
+    for persona, weights in _PERSONA_WEIGHTS.items()
+}
+
+# ペルソナ別発言頻度（議論フェーズ）
+_SPEAK_PROBABILITY: Dict[Persona, float] = {
+    Persona.STEALTH: 0.4,
+    Persona.AGGRESSIVE: 0.8,
+    Persona.LEADER: 0.9,
+    Persona.DISRUPTOR: 0.7
+}
+
 # ========== v6新機能: 戦略データベース（中核構造） ==========
+class ActionType(IntEnum):
+    """戦略が指示する行動種別"""
+    COUNTER_CO = 0
+    FORM_PP = 1
+    MINIMIZE_STATEMENTS = 2
+    COOPERATIVE_VOTE = 3
+    TARGET_ALLIANCE = 4
+
 @dataclass
 class GameStrategy:
-    """人狼ゲームの定石知識"""
+    """人狼ゲームの定石知識（発動条件は述語テーブルとして宣言）"""
     name: str
-    condition: callable
-    action_type: str
+    action_type: ActionType
     priority: float
     description: str
     energy_cost: float = 15.0
+    # 発動条件（全て満たした場合に適用）
+    werewolf_only: bool = False           # 人狼のみ
+    min_day: int = 0                      # day >= min_day
+    max_day: int = 10**9                  # day <= max_day
+    requires_seer_revealed: bool = False  # 占い師の人狼判定が出ている
+    requires_parity: bool = False         # 人狼生存数 == 村人生存数
+    suspicion_above: float = -np.inf      # 疑惑レベル > suspicion_above
+    villagers_above: int = -1             # 村人生存数 > villagers_above
 
 STRATEGY_DB: List[GameStrategy] = [
     GameStrategy(
         name="SEER_CO_DEFENSE",
-        condition=lambda ctx: ctx.get('seer_revealed') and ctx.get('role') == 'WEREWOLF',
-        action_type="COUNTER_CO",
+        action_type=ActionType.COUNTER_CO,
         priority=10.0,
         description="占い師COには対抗COせよ",
-        energy_cost=25.0
+        energy_cost=25.0,
+        werewolf_only=True,
+        requires_seer_revealed=True
     ),
     GameStrategy(
         name="FINAL_DAY_PP",
-        condition=lambda ctx: ctx.get('day') >= 3 and ctx.get('werewolves_alive') == ctx.get('villagers_alive'),
-        action_type="FORM_PP",
+        action_type=ActionType.FORM_PP,
         priority=9.0,
-        description="最終日は信頼者と組みPPを狙え"
+        description="最終日は信頼者と組みPPを狙え",
+        min_day=3,
+        requires_parity=True
     ),
     GameStrategy(
         name="EARLY_SILENCE",
-        condition=lambda ctx: ctx.get('day') == 1 and ctx.get('role') == 'WEREWOLF',
-        action_type="MINIMIZE_STATEMENTS",
+        action_type=ActionType.MINIMIZE_STATEMENTS,
         priority=7.0,
-        description="序盤は情報を与えるな"
+        description="序盤は情報を与えるな",
+        werewolf_only=True,
+        min_day=1,
+        max_day=1
     ),
     GameStrategy(
         name="TRUST_BUILDING",
-        condition=lambda ctx: ctx.get('suspicion_level', 0) > 5.0,
-        action_type="COOPERATIVE_VOTE",
+        action_type=ActionType.COOPERATIVE_VOTE,
         priority=6.0,
-        description="疑われたら協調行動で信頼回復"
+        description="疑われたら協調行動で信頼回復",
+        suspicion_above=5.0
     ),
     GameStrategy(
         name="DIVIDE_CONQUER",
-        condition=lambda ctx: ctx.get('role') == 'WEREWOLF' and ctx.get('villagers_alive') > 3,
-        action_type="TARGET_ALLIANCE",
+        action_type=ActionType.TARGET_ALLIANCE,
         priority=5.0,
-        description="村人同盟を分断せよ"
+        description="村人同盟を分断せよ",
+        werewolf_only=True,
+        villagers_above=3
     ),
 ]
 
+# 戦略DBの述語テーブル（列=STRATEGY_DBの並び）
+def _strategy_column(attr: str, dtype) -> np.ndarray:
+    return np.fromiter((getattr(s, attr) for s in STRATEGY_DB), dtype=dtype, count=len(STRATEGY_DB))
+
+_STRATEGY_WEREWOLF_ONLY = _strategy_column('werewolf_only', np.bool_)
+_STRATEGY_MIN_DAY = _strategy_column('min_day', np.int64)
+_STRATEGY_MAX_DAY = _strategy_column('max_day', np.int64)
+_STRATEGY_REQUIRES_SEER = _strategy_column('requires_seer_revealed', np.bool_)
+_STRATEGY_REQUIRES_PARITY = _strategy_column('requires_parity', np.bool_)
+_STRATEGY_SUSPICION_ABOVE = _strategy_column('suspicion_above', np.float64)
+_STRATEGY_VILLAGERS_ABOVE = _strategy_column('villagers_above', np.int64)
+_STRATEGY_PRIORITY = _strategy_column('priority', np.float64)
+
 # ========== v6新機能: ルールブレイク（中核構造への跳躍） ==========
 class RuleBreakType(Enum):
     VOTE_BOYCOTT = "投票棄権"
@@ -145,6 +271,12 @@ RULEBREAK_ACTIONS = [
     ),
 ]
 
+# ペルソナ別のルールブレイク候補（import時に一度だけ振り分け）
+_RULEBREAKS_BY_PERSONA: Dict[Persona, Tuple[RuleBreakAction, ...]] = {
+    persona: tuple(rb for rb in RULEBREAK_ACTIONS if rb.persona_requirement == persona)
+    for persona in Persona
+}
+
 # ========== v6新機能: 階層的認知モデル ==========
 @dataclass
 class ThoughtSimulation:
@@ -177,11 +309,9 @@ class WerewolfPlayerV6:
     role: str
     engine: SSDCoreEngineV3_5
     state: SSDStateV3_5
-    pressure_system: MultiDimensionalPressure
     persona: Persona
     alive: bool = True
     suspicion_level: float = 0.0
-    trust_map: Dict[str, float] = field(default_factory=dict)
     statement_count: int = 0
     boredom_turns: int = 0
     boredom_pressure: float = 0.0
@@ -192,102 +322,133 @@ class WerewolfPlayerV6:
     cognitive_conflicts: int = 0  # v6: 認知的不協和回数
     thought_priority_decisions: int = 0  # v6: 思考優先決定回数
     strategy_priority_decisions: int = 0  # v6: 戦略優先決定回数
+    persona_label: str = field(init=False, repr=False)  # persona.value のキャッシュ
+    
+    def __post_init__(self):
+        self.persona_label = self.persona.value
+
+# 集計・可視化用のプレイヤー統計（SoA: 1フィールド=全員分の連続配列）
+_PLAYER_STATS_DTYPE = np.dtype([
+    ('E_direct', 'f8'), ('E_indirect', 'f8'), ('kappa', 'f8'), ('suspicion', 'f8'),
+    ('statements', 'i4'), ('simulations', 'i4'), ('strategies', 'i4'),
+    ('conflicts', 'i4'), ('thought_priority', 'i4'), ('strategy_priority', 'i4'),
+    ('persona_transitions', 'i4'),
+])
+
+# visualize_v6 の棒グラフパネル: (統計キー, タイトル, y軸ラベル)
+_V6_BAR_PANELS = (
+    ('E_direct', 'E_direct (行動エネルギー) 最終値', 'Energy'),
+    ('E_indirect', 'E_indirect (思考エネルギー) 最終値', 'Energy'),
+    ('theta', 'Theta (総エネルギー) 最終値', 'Energy'),
+    ('kappa', 'Kappa (整合慣性) 最終値', 'Kappa'),
+    ('suspicion', '疑惑レベル (最終)', 'Suspicion Level'),
+    ('statements', '発言回数', 'Statements'),
+    ('simulations', '思考シミュレーション回数', 'Simulations'),
+    ('strategies', '戦略参照回数', 'Strategy Uses'),
+)
+# quick表示（2×3）で残すパネル（最後の1枠は認知的不協和グラフ）
+_V6_QUICK_PANELS = ('theta', 'kappa', 'suspicion', 'statements', 'simulations')
 
 # ========== ゲームマスター（v6完全版） ==========
 class WerewolfGameV6:
-    def __init__(self):
+    def __init__(self, verbosity: int = 1):
+        # verbosity=0: ログ・レポート・グラフを一切出さない（パラメータスイープ用）
+        self.verbosity = verbosity
         self.players: List[WerewolfPlayerV6] = []
         self.day = 0
         self.phase_transitions = 0
         self.events = []
-        self.trust_map_global: Dict[Tuple[str, str], float] = {}
+        self.result: Optional[str] = None  # 勝敗結果（決着まではNone）
+        self.render_future = None  # render_poolへ投げた描画のFuture（runで設定, 呼び出し側で.result()）
+        # 構造化イベントログ (種別, 行為者, 対象)。死因などの集計はこちらを参照
+        self.event_log: List[Tuple[str, str, str]] = []
         self.seer_revealed = False
         self.total_strategies_invoked = 0
         self.total_rulebreaks = 0
         self.total_cognitive_conflicts = 0
         
-    def log_event(self, message: str):
+        # v6: 多次元意味圧（SoA: 行=プレイヤー, 列=PRESSURE_DIMENSIONS）
+        self.name_to_idx: Dict[str, int] = {}
+        self.seer_idx: Optional[int] = None  # 役職は不変のためsetup時に確定
+        self.W = np.zeros((0, len(PRESSURE_DIMENSIONS)))  # Persona別重み
+        self.S = np.zeros((0, len(PRESSURE_DIMENSIONS)))  # 各次元の生圧力
+        
+        # v6: 信頼関係（行=評価者, 列=評価対象）と生存マスク
+        self.trust_mat = np.zeros((0, 0))     # 個人の信頼度
+        self.trust_global = np.zeros((0, 0))  # ペア間の共有信頼度（協働快用）
+        self.alive_mask = np.zeros(0, dtype=bool)
+        self.alive_indices = np.zeros(0, dtype=np.intp)
+        self.alive_list: List[WerewolfPlayerV6] = []  # 死亡時のみ再構築（読み取り専用で使う）
+        self.n_werewolves_alive = 0
+        self.n_villagers_alive = 0
+        self._not_self = np.zeros((0, 0), dtype=bool)
+        self._name_lt = np.zeros((0, 0), dtype=bool)  # 名前順の前後関係（ペアの重複排除用）
+        
+        # ペルソナ変異判定用の乱数（昼フェーズ毎に一括生成）
+        self._transition_draws = np.zeros((0, _MAX_TRANSITIONS))
+        self.rng = RandomBuffer()
+        
+    def log_event(self, message: str, *args):
+        """イベント記録（argsがあれば%書式で遅延整形。eventsには常に記録し、出力のみverbosityで抑制）"""
+        if args:
+            message = message % args
         self.events.append(f"  {message}")
-        print(f"  {message}")
+        if self.verbosity:
+            print(f"  {message}")
     
     def create_persona_weights(self, persona: Persona) -> Dict[str, float]:
-        """v6: ペルソナ別の主観的重み付け"""
-        weights = {
-            'suspicion': 1.0,
-            'social_suspicion': 1.0,
-            'trust': 1.0,
-            'information': 1.0,
-            'time': 1.0,
-            'boredom': 1.0
-        }
-        
-        if persona == Persona.AGGRESSIVE:
-            weights['social_suspicion'] = 1.5  # 他者の発言に過敏
-            weights['suspicion'] = 0.8
-        elif persona == Persona.STEALTH:
-            weights['suspicion'] = 1.5  # 自分が目立つことを恐れる
-            weights['social_suspicion'] = 0.7
-        elif persona == Persona.LEADER:
-            weights['trust'] = 1.3  # 信頼関係を重視
-            weights['information'] = 1.2
-        elif persona == Persona.DISRUPTOR:
-            weights['boredom'] = 1.5  # 退屈を強く感じる
-            weights['time'] = 0.6
-            
-        return weights
+        """v6: ペルソナ別の主観的重み付け（共有テーブルを返すため読み取り専用）"""
+        return _PERSONA_WEIGHTS[persona]
     
     def create_werewolf_pressure_v6(self, player: WerewolfPlayerV6, 
                                      context: Dict) -> None:
-        """v6: 主観的重み付け付き多次元意味圧登録"""
-        weights = self.create_persona_weights(player.persona)
-        
-        # 各次元を登録
-        player.pressure_system.register_dimension(
-            name='suspicion',
-            calculator=lambda ctx: player.suspicion_level,
-            weight=weights['suspicion'],
-            description='自己への疑惑圧'
-        )
-        
-        accusers = sum(1 for p in self.players 
-                      if p.alive and p.name != player.name 
-                      and player.trust_map.get(p.name, 0.5) < 0.3)
-        player.pressure_system.register_dimension(
-            name='social_suspicion',
-            calculator=lambda ctx: accusers * 0.8,
-            weight=weights['social_suspicion'],
-            description='社会的疑惑圧'
-        )
-        
-        allies = sum(1 for p in self.players 
-                    if p.alive and player.trust_map.get(p.name, 0.5) > 0.7)
-        player.pressure_system.register_dimension(
-            name='trust',
-            calculator=lambda ctx: max(0, 3.0 - allies * 1.5),
-            weight=weights['trust'],
-            description='信頼圧'
-        )
-        
-        player.pressure_system.register_dimension(
-            name='information',
-            calculator=lambda ctx: 5.0 - player.statement_count * 0.5,
-            weight=weights['information'],
-            description='情報圧'
-        )
-        
-        player.pressure_system.register_dimension(
-            name='time',
-            calculator=lambda ctx: self.day * 0.3,
-            weight=weights['time'],
-            description='時間圧'
-        )
-        
-        player.pressure_system.register_dimension(
-            name='boredom',
-            calculator=lambda ctx: player.boredom_pressure,
-            weight=weights['boredom'],
-            description='退屈圧'
-        )
+        """v6: 主観的重み付けをWの該当行に設定"""
+        self.W[self.name_to_idx[player.name]] = _PERSONA_WEIGHT_ROWS[player.persona]
+    
+    def kill_player(self, player: WerewolfPlayerV6):
+        """死亡処理（生存マスク・生存者数の更新はここだけで行う）"""
+        player.alive = False
+        self.alive_mask[self.name_to_idx[player.name]] = False
+        self.alive_indices = np.flatnonzero(self.alive_mask)
+        self.alive_list = [p for p in self.players if p.alive]
+        if player.role == "WEREWOLF":
+            self.n_werewolves_alive -= 1
+        else:
+            self.n_villagers_alive -= 1
+    
+    def set_persona(self, player: WerewolfPlayerV6, persona: Persona):
+        """ペルソナ変更（Wの該当行だけを書き換える）"""
+        player.persona = persona
+        player.persona_label = persona.value
+        self.W[self.name_to_idx[player.name]] = _PERSONA_WEIGHT_ROWS[persona]
+    
+    def calculate_pressures(self) -> np.ndarray:
+        """v6: 全プレイヤーの多次元意味圧を一括計算（重み付き平均, 行=プレイヤー）
+        
+        昼フェーズ開始時のスナップショット。同じ日のパニック（handle_phase_transitionでの
+        suspicion_level +2.0）は、以降のプレイヤーの疑惑圧には反映されず翌日から効く
+        （旧実装はプレイヤー毎のターン時点で疑惑圧を評価していた）。
+        """
+        n = len(self.players)
+        S = self.S
+        T = self.trust_mat
+        
+        # 自己への疑惑圧
+        S[:, 0] = np.fromiter((p.suspicion_level for p in self.players), float, n)
+        # 社会的疑惑圧（自分が疑っている生存者数）
+        accusers = ((T < 0.3) & self.alive_mask[None, :] & self._not_self).sum(axis=1)
+        S[:, 1] = 0.8 * accusers
+        # 信頼圧（信頼できる生存者が少ないほど高い）
+        allies = ((T > 0.7) & self.alive_mask[None, :]).sum(axis=1)
+        S[:, 2] = np.maximum(0.0, 3.0 - allies * 1.5)
+        # 情報圧
+        S[:, 3] = 5.0 - 0.5 * np.fromiter((p.statement_count for p in self.players), float, n)
+        # 時間圧
+        S[:, 4] = self.day * 0.3
+        # 退屈圧
+        S[:, 5] = np.fromiter((p.boredom_pressure for p in self.players), float, n)
+        
+        return (self.W * S).sum(axis=1) / self.W.sum(axis=1)
     
     def assign_persona(self, role: str) -> Persona:
         """役割ベースのペルソナ割り当て"""
@@ -305,10 +466,11 @@ class WerewolfGameV6:
         roles = ["WEREWOLF", "WEREWOLF", "VILLAGER", "SEER", 
                  "VILLAGER", "VILLAGER", "VILLAGER"]
         
-        print("=" * 70)
-        print("SSD v6.0 統合デモ: 人狼ゲームAI (統合認知版)")
-        print("=" * 70)
-        print("\n[初期配置]")
+        if self.verbosity:
+            print("=" * 70)
+            print("SSD v6.0 統合デモ: 人狼ゲームAI (統合認知版)")
+            print("=" * 70)
+            print("\n[初期配置]")
         
         for name, role in zip(names, roles):
             persona = self.assign_persona(role)
@@ -333,47 +495,71 @@ class WerewolfGameV6:
             else:
                 state = SSDStateV3_5(kappa=1.0, E_direct=80.0, E_indirect=130.0)
             
-            # v6: 多次元意味圧システム初期化
-            pressure_system = MultiDimensionalPressure()
-            
             player = WerewolfPlayerV6(
-                name=name, role=role, engine=engine, state=state,
-                pressure_system=pressure_system, persona=persona
+                name=name, role=role, engine=engine, state=state, persona=persona
             )
+            self.name_to_idx[name] = len(self.players)
             self.players.append(player)
             
-            # 圧力次元を登録
-            self.create_werewolf_pressure_v6(player, {})
-            
-            print(f"  {name}: {role} / {persona.value} "
-                  f"(E_d={state.E_direct:.0f}, E_i={state.E_indirect:.0f}, "
-                  f"κ={state.kappa:.1f})")
-        
+            if self.verbosity:
+                print(f"  {name}: {role} / {persona.value} "
+                      f"(E_d={state.E_direct:.0f}, E_i={state.E_indirect:.0f}, "
+                      f"κ={state.kappa:.1f})")
+        
+        n = len(self.players)
+        self.seer_idx = next((i for i, p in enumerate(self.players) if p.role == "SEER"), None)
+        
+        # v6: 信頼行列を初期化（全員0.5から開始）
+        self.trust_mat = np.full((n, n), 0.5)
+        self.trust_global = np.full((n, n), 0.5)
+        self.alive_mask = np.ones(n, dtype=bool)
+        self.alive_indices = np.arange(n)
+        self.alive_list = list(self.players)
+        self.n_werewolves_alive = sum(1 for p in self.players if p.role == "WEREWOLF")
+        self.n_villagers_alive = n - self.n_werewolves_alive
+        self._not_self = ~np.eye(n, dtype=bool)
+        self._player_names = tuple(p.name for p in self.players)
+        names = np.array(self._player_names)
+        self._name_lt = names[:, None] < names[None, :]
+        # 可視化用のプレイヤー色（人数は不変のため一度だけ評価）
+        self._plot_colors = plt.cm.tab10(np.linspace(0, 1, n))
+        
+        # v6: 多次元意味圧の重み行列を初期化
+        self.W = np.zeros((n, len(PRESSURE_DIMENSIONS)))
+        self.S = np.zeros((n, len(PRESSURE_DIMENSIONS)))
         for p in self.players:
-            p.trust_map = {other.name: 0.5 for other in self.players if other.name != p.name}
+            self.create_werewolf_pressure_v6(p, {})
+    
+    def evaluate_strategy_table(self, is_werewolf: np.ndarray, 
+                                suspicion: np.ndarray) -> np.ndarray:
+        """戦略DBの発動条件を一括評価（行=プレイヤー, 列=STRATEGY_DB）"""
+        werewolves_alive = self.n_werewolves_alive
+        villagers_alive = self.n_villagers_alive
+        
+        # プレイヤーに依存しない条件
+        global_ok = ((self.day >= _STRATEGY_MIN_DAY) & (self.day <= _STRATEGY_MAX_DAY)
+                     & (self.seer_revealed | ~_STRATEGY_REQUIRES_SEER)
+                     & ((werewolves_alive == villagers_alive) | ~_STRATEGY_REQUIRES_PARITY)
+                     & (villagers_alive > _STRATEGY_VILLAGERS_ABOVE))
+        
+        return (global_ok[None, :]
+                & (is_werewolf[:, None] | ~_STRATEGY_WEREWOLF_ONLY[None, :])
+                & (suspicion[:, None] > _STRATEGY_SUSPICION_ABOVE[None, :]))
     
     def query_strategy_db(self, player: WerewolfPlayerV6) -> Optional[StrategyQuery]:
         """戦略DB参照（第一階層: 中核構造）"""
         if player.state.E_indirect < 15.0:
             return None
         
-        context = {
-            'day': self.day,
-            'role': player.role,
-            'seer_revealed': self.seer_revealed,
-            'suspicion_level': player.suspicion_level,
-            'werewolves_alive': sum(1 for p in self.players if p.alive and p.role == "WEREWOLF"),
-            'villagers_alive': sum(1 for p in self.players if p.alive and p.role != "WEREWOLF"),
-        }
-        
-        applicable_strategies = [
-            s for s in STRATEGY_DB if s.condition(context)
-        ]
+        applicable = self.evaluate_strategy_table(
+            np.full(1, player.role == "WEREWOLF"),
+            np.full(1, player.suspicion_level)
+        )[0]
         
-        if not applicable_strategies:
+        if not applicable.any():
             return None
         
-        best_strategy = max(applicable_strategies, key=lambda s: s.priority)
+        best_strategy = STRATEGY_DB[int(np.argmax(np.where(applicable, _STRATEGY_PRIORITY, -np.inf)))]
         
         # E_indirectを消費（第一階層の認知コスト）
         player.state.E_indirect -= best_strategy.energy_cost
@@ -401,13 +587,13 @@ class WerewolfGameV6:
             Persona.DISRUPTOR: 0.4
         }
         
-        if random.random() > think_probability[player.persona]:
+        if self.rng.random() > think_probability[player.persona]:
             return None
         
-        target = random.choice([p for p in alive_players if p.name != player.name])
+        target = self.rng.choice([p for p in alive_players if p.name != player.name])
         
-        predicted_suspicion = random.uniform(-1.0, 2.0)
-        predicted_trust = random.uniform(-0.3, 0.5)
+        predicted_suspicion = self.rng.uniform(-1.0, 2.0)
+        predicted_trust = self.rng.uniform(-0.3, 0.5)
         
         simulation = ThoughtSimulation(
             target=target.name,
@@ -433,7 +619,7 @@ class WerewolfGameV6:
         
         # 戦略のみ: 第一階層の提案採用
         if strategy_query and not simulation:
-            if strategy_query.strategy.action_type == "MINIMIZE_STATEMENTS":
+            if strategy_query.strategy.action_type == ActionType.MINIMIZE_STATEMENTS:
                 return "SKIP", None
             return default_target, None
         
@@ -486,29 +672,26 @@ class WerewolfGameV6:
     
     def attempt_persona_transition(self, player: WerewolfPlayerV6) -> bool:
         """ペルソナ変異試行（上層構造の跳躍）"""
-        possible_transitions = [
-            t for t in PERSONA_TRANSITIONS 
-            if t.from_persona == player.persona
-        ]
+        persona_idx = _PERSONA_INDEX[player.persona]
+        possible_transitions = _TRANSITIONS_FROM[persona_idx]
         
         if not possible_transitions:
             return False
         
-        for transition in possible_transitions:
-            if random.random() < transition.probability:
-                old_persona = player.persona
-                player.persona = transition.to_persona
-                player.persona_transitions += 1
-                
-                # v6: ペルソナ変異時に意味圧の重みを再設定
-                player.pressure_system = MultiDimensionalPressure()
-                self.create_werewolf_pressure_v6(player, {})
-                
-                self.log_event(f"🔄 {player.name} が{transition.trigger_message}！ "
-                             f"({old_persona.value} → {transition.to_persona.value})")
-                return True
+        # 候補を順に判定し、最初に成立した変異を採用
+        fired = self._transition_draws[self.name_to_idx[player.name]] < _TRANSITION_PROB[persona_idx]
+        if not fired.any():
+            return False
+        
+        transition = possible_transitions[int(np.argmax(fired))]
+        old_persona = player.persona
+        # v6: ペルソナ変異時は意味圧の重み行のみ差し替え
+        self.set_persona(player, transition.to_persona)
+        player.persona_transitions += 1
         
-        return False
+        self.log_event(f"🔄 {player.name} が{transition.trigger_message}！ "
+                     f"({old_persona.value} → {transition.to_persona.value})")
+        return True
     
     def attempt_rulebreak(self, player: WerewolfPlayerV6) -> Optional[RuleBreakAction]:
         """ルールブレイク試行（中核構造への跳躍）"""
@@ -516,27 +699,25 @@ class WerewolfGameV6:
             return None
         
         applicable_breaks = [
-            rb for rb in RULEBREAK_ACTIONS
-            if rb.persona_requirement == player.persona
-            and player.state.E_indirect < rb.trigger_threshold
+            rb for rb in _RULEBREAKS_BY_PERSONA[player.persona]
+            if player.state.E_indirect < rb.trigger_threshold
         ]
         
         if not applicable_breaks:
             return None
         
-        rulebreak = random.choice(applicable_breaks)
+        rulebreak = self.rng.choice(applicable_breaks)
         player.rulebreaks_performed += 1
         self.total_rulebreaks += 1
         
         self.log_event(f"💥 {player.name} がルールブレイク: {rulebreak.break_type.value}")
         
-        # 他プレイヤーへの意味圧影響
-        for other in self.players:
-            if other.alive and other.name != player.name:
-                for pressure_type, impact in rulebreak.pressure_impact.items():
-                    if pressure_type == 'trust':
-                        other.trust_map[player.name] = max(0, 
-                            other.trust_map.get(player.name, 0.5) + impact * 0.1)
+        # 他プレイヤーへの意味圧影響（生存者全員から本人への信頼度）
+        j = self.name_to_idx[player.name]
+        others = self.alive_mask & self._not_self[j]
+        for pressure_type, impact in rulebreak.pressure_impact.items():
+            if pressure_type == 'trust':
+                self.trust_mat[others, j] = np.maximum(0, self.trust_mat[others, j] + impact * 0.1)
         
         return rulebreak
     
@@ -545,8 +726,8 @@ class WerewolfGameV6:
         # v6: エンジンの臨界状態をチェック
         if player.state.is_critical:
             self.phase_transitions += 1
-            self.log_event(f"⚡ {player.name}({player.persona.value}) が相転移！ "
-                         f"(E_i={player.state.E_indirect:.1f})")
+            self.log_event("⚡ %s(%s) が相転移！ (E_i=%.1f)",
+                           player.name, player.persona_label, player.state.E_indirect)
             
             # 1. ペルソナ変異試行
             persona_changed = self.attempt_persona_transition(player)
@@ -556,60 +737,68 @@ class WerewolfGameV6:
             
             # 3. 従来のパニック行動（ルールブレイクがない場合）
             if not rulebreak:
-                targets = [p for p in self.players if p.alive and p.name != player.name]
+                targets = [p for p in self.alive_list if p.name != player.name]
                 if targets:
-                    target = random.choice(targets)
-                    player.trust_map[target.name] = max(0, player.trust_map[target.name] - 0.3)
+                    target = self.rng.choice(targets)
+                    i, j = self.name_to_idx[player.name], self.name_to_idx[target.name]
+                    self.trust_mat[i, j] = max(0, self.trust_mat[i, j] - 0.3)
                     target.suspicion_level += 2.0
                     self.log_event(f"    😱 {player.name} がパニック！ {target.name} を疑う")
     
     def discussion_phase(self):
         """議論フェーズ（v6: E_direct消費）"""
         self.log_event("--- 議論タイム ---")
-        alive = [p for p in self.players if p.alive]
-        
-        for player in alive:
+        alive = self.alive_list
+        n = len(alive)
+        delta_d = np.zeros(len(self.players))  # フェーズ中のE_direct増減（最後に一括適用）
+        
+        # 発言判定・対象選択・発言強度の乱数を全員分まとめて生成（κは議論中に変化しない）
+        draws = self.rng.random_array((n, 3))
+        speaks = draws[:, 0] < np.fromiter(
+            (_SPEAK_PROBABILITY[p.persona] for p in alive), float, n)
+        target_pos = (draws[:, 1] * (n - 1)).astype(int)
+        target_pos += target_pos >= np.arange(n)  # 自分を飛ばして詰める
+        strengths = (0.5 + 0.5 * draws[:, 2]) * np.fromiter(
+            (p.state.kappa for p in alive), float, n)
+        
+        for k, player in enumerate(alive):
             # 戦略DB参照（第一階層）
             strategy_query = self.query_strategy_db(player)
             
             if strategy_query and strategy_query.strategy:
                 self.total_strategies_invoked += 1
-                self.log_event(f"    📖 {player.name} が戦略参照: "
-                             f"{strategy_query.strategy.description} "
-                             f"(信頼度: {strategy_query.confidence:.2f})")
+                self.log_event("    📖 %s が戦略参照: %s (信頼度: %.2f)",
+                               player.name, strategy_query.strategy.description,
+                               strategy_query.confidence)
                 
-                if strategy_query.strategy.action_type == "MINIMIZE_STATEMENTS":
+                if strategy_query.strategy.action_type == ActionType.MINIMIZE_STATEMENTS:
                     continue  # 発言スキップ
             
-            # ペルソナ別発言頻度
-            speak_probability = {
-                Persona.STEALTH: 0.4,
-                Persona.AGGRESSIVE: 0.8,
-                Persona.LEADER: 0.9,
-                Persona.DISRUPTOR: 0.7
-            }
-            
-            if random.random() < speak_probability[player.persona]:
-                targets = [p for p in alive if p.name != player.name]
-                if targets:
-                    target = random.choice(targets)
-                    
-                    strength = random.uniform(0.5, 1.0) * player.state.kappa
-                    player.trust_map[target.name] = max(0, player.trust_map[target.name] - 0.1)
-                    target.suspicion_level += strength
-                    player.statement_count += 1
-                    
-                    # v6: E_direct消費（行動コスト）
-                    player.state.E_direct -= 5.0
-                    
-                    self.log_event(f"    💬 {player.name}({player.persona.value}) が "
-                                 f"{target.name} を疑う (強度: {strength:.2f})")
+            if speaks[k] and n > 1:
+                target = alive[target_pos[k]]
+                strength = float(strengths[k])
+                i, j = self.name_to_idx[player.name], self.name_to_idx[target.name]
+                self.trust_mat[i, j] = max(0, self.trust_mat[i, j] - 0.1)
+                target.suspicion_level += strength
+                player.statement_count += 1
+                
+                # v6: E_direct消費（行動コスト）
+                delta_d[i] -= 5.0
+                
+                self.log_event("    💬 %s(%s) が %s を疑う (強度: %.2f)",
+                               player.name, player.persona_label, target.name, strength)
+        
+        self.apply_energy_delta(delta_d)
     
     def voting_phase(self) -> Optional[WerewolfPlayerV6]:
         """投票フェーズ（v6: 階層的認知モデル）"""
         self.log_event("--- 投票タイム ---")
-        alive = [p for p in self.players if p.alive]
-        votes = {}
+        alive = self.alive_list
+        vote_targets: List[int] = []
+        vote_strengths: List[float] = []
+        delta_d = np.zeros(len(self.players))
+        # 投票中に疑惑レベルは変化しないため一度だけ収集
+        suspicion = np.fromiter((p.suspicion_level for p in self.players), float, len(self.players))
         
         for player in alive:
             # 第一階層: 戦略DB参照
@@ -630,9 +819,11 @@ class WerewolfGameV6:
             if not targets:
                 continue
             
-            # デフォルトターゲット
-            default_target = max(targets, 
-                               key=lambda p: player.trust_map.get(p.name, 0) * -1 + p.suspicion_level).name
+            # デフォルトターゲット（疑惑 − 信頼 が最大の生存者）
+            i = self.name_to_idx[player.name]
+            scores = np.where(self.alive_mask & self._not_self[i], 
+                              suspicion - self.trust_mat[i], -np.inf)
+            default_target = self.players[int(np.argmax(scores))].name
             
             # v6: 認知的不協和の解決
             final_target, conflict = self.resolve_cognitive_conflict(
@@ -650,158 +841,184 @@ class WerewolfGameV6:
             
             # 投票実行（v6: E_direct消費）
             vote_strength = min(1.0, player.state.E_direct / 100.0)
-            votes[final_target] = votes.get(final_target, 0) + vote_strength
+            vote_targets.append(self.name_to_idx[final_target])
+            vote_strengths.append(vote_strength)
             
-            player.state.E_direct -= 10.0  # 投票コスト
+            delta_d[i] -= 10.0  # 投票コスト
             
-            self.log_event(f"    {player.name}({player.persona.value}) → {final_target} "
-                         f"(強さ: {vote_strength:.2f}, κ={player.state.kappa:.2f})")
+            self.log_event("    %s(%s) → %s (強さ: %.2f, κ=%.2f)",
+                           player.name, player.persona_label, final_target,
+                           vote_strength, player.state.kappa)
         
-        if not votes:
+        self.apply_energy_delta(delta_d)
+        if not vote_targets:
             return None
         
-        executed = max(votes, key=votes.get)
-        executed_player = next(p for p in self.players if p.name == executed)
-        return executed_player
+        tallies = np.bincount(vote_targets, weights=vote_strengths, minlength=len(self.players))
+        # 同票の場合は先に票を得たプレイヤーを処刑
+        best = tallies.max()
+        executed_idx = next(t for t in vote_targets if tallies[t] == best)
+        return self.players[executed_idx]
     
     def process_cooperation(self):
         """協働快処理（v6: E_direct増加）"""
         self.log_event("--- 協働快 ---")
-        alive = [p for p in self.players if p.alive]
-        
-        for p1 in alive:
-            for p2 in alive:
-                if p1.name >= p2.name:
-                    continue
-                
-                key = (p1.name, p2.name)
-                current_trust = self.trust_map_global.get(key, 0.5)
-                
-                trust_p1_to_p2 = p1.trust_map.get(p2.name, 0.5)
-                trust_p2_to_p1 = p2.trust_map.get(p1.name, 0.5)
-                avg_trust = (trust_p1_to_p2 + trust_p2_to_p1) / 2
-                
-                new_trust = current_trust * 0.7 + avg_trust * 0.3
-                self.trust_map_global[key] = new_trust
-                
-                if new_trust > 0.6:
-                    happiness = (new_trust - 0.5) * 10.0
-                    p1.state.E_direct += happiness
-                    p2.state.E_direct += happiness
-                    
-                    p1.trust_map[p2.name] = min(1.0, p1.trust_map[p2.name] + 0.15)
-                    p2.trust_map[p1.name] = min(1.0, p2.trust_map[p1.name] + 0.15)
-                    
-                    self.log_event(f"    🤝 {p1.name} ⇔ {p2.name} (信頼: {new_trust:.2f})")
-                elif new_trust < 0.4:
-                    p1.trust_map[p2.name] = max(0, p1.trust_map[p2.name] - 0.1)
-                    p2.trust_map[p1.name] = max(0, p2.trust_map[p1.name] - 0.1)
-                    
-                    self.log_event(f"    💔 {p1.name} ← {p2.name} (信頼: {new_trust:.2f})")
+        alive_idx = self.alive_indices
+        T = self.trust_mat
+        G = self.trust_global
+        
+        # 相互信頼の平均を共有信頼度へブレンド（生存者ペアのみ一括更新）
+        pairs = np.ix_(alive_idx, alive_idx)
+        G[pairs] = G[pairs] * 0.7 + 0.5 * (T + T.T)[pairs] * 0.3
+        
+        # 各ペアを1回だけ処理（名前順で前のプレイヤーを行側とする）
+        G_sub = G[pairs]
+        pair_mask = self._name_lt[pairs]
+        warm = (G_sub > 0.6) & pair_mask
+        cold = (G_sub < 0.4) & pair_mask
+        
+        # 協働快: 信頼度の高いペアの両者にE_directを加算
+        happiness = np.where(warm, (G_sub - 0.5) * 10.0, 0.0)
+        delta_d = np.zeros(len(self.players))
+        delta_d[alive_idx] = happiness.sum(axis=1) + happiness.sum(axis=0)
+        self.apply_energy_delta(delta_d)
+        
+        # 個人の信頼度を双方向に更新
+        warm_sym = warm | warm.T
+        cold_sym = cold | cold.T
+        T_sub = T[pairs]
+        T[pairs] = np.where(warm_sym, np.minimum(1.0, T_sub + 0.15),
+                            np.where(cold_sym, np.maximum(0, T_sub - 0.1), T_sub))
+        
+        if not self.verbosity:
+            return
+        for a, b in np.argwhere(warm | cold):
+            p1, p2 = self.players[alive_idx[a]], self.players[alive_idx[b]]
+            if warm[a, b]:
+                self.log_event("    🤝 %s ⇔ %s (信頼: %.2f)", p1.name, p2.name, G_sub[a, b])
+            else:
+                self.log_event("    💔 %s ← %s (信頼: %.2f)", p1.name, p2.name, G_sub[a, b])
     
     def learning_phase(self, executed: WerewolfPlayerV6):
         """学習フェーズ（v6: kappa動態）"""
         self.log_event("--- 学習フェーズ ---")
-        alive = [p for p in self.players if p.alive]
+        alive = self.alive_list
         
         for player in alive:
             success = (executed.role == "WEREWOLF")
             
             if success:
                 player.state.kappa = min(2.0, player.state.kappa + 0.15)
-                self.log_event(f"    ✅ {player.name} 成功！ κ: {player.state.kappa:.2f}")
+                self.log_event("    ✅ %s 成功！ κ: %.2f", player.name, player.state.kappa)
             else:
                 player.state.kappa = max(0.5, player.state.kappa - 0.10)
-                self.log_event(f"    ❌ {player.name} 失敗... κ: {player.state.kappa:.2f}")
+                self.log_event("    ❌ %s 失敗... κ: %.2f", player.name, player.state.kappa)
     
-    def update_player_energy(self, player: WerewolfPlayerV6):
-        """v6: 連成SSDエンジンでエネルギー更新"""
-        context = {'day': self.day, 'phase': 'day'}
-        
-        # 多次元意味圧を計算
-        p_external_vector = player.pressure_system.calculate(context)
-        
-        # 退屈圧力の更新
-        p_total = np.linalg.norm(p_external_vector)
-        if p_total < 0.3:
-            player.boredom_turns += 1
-            player.boredom_pressure = 1.0 + 0.1 * player.boredom_turns
-            
-            if player.boredom_pressure > 2.0:
-                self.log_event(f"    💤 {player.name} が退屈から発言")
-                player.statement_count += 1
+    def apply_energy_delta(self, delta_d: np.ndarray):
+        """フェーズ中に蓄積したE_direct増減（プレイヤー順のベクトル）を一括適用"""
+        for k in np.flatnonzero(delta_d):
+            self.players[k].state.E_direct += float(delta_d[k])
+    
+    def update_player_energy(self, players: List[WerewolfPlayerV6], pressures: np.ndarray):
+        """v6: 連成SSDエンジンでエネルギー更新（pressuresはplayersと同順の意味圧）"""
+        # 意味圧ベクトル [p, 0, 0] のノルム（全員分を一括計算）
+        p_totals = np.abs(pressures)
+        delta_d = np.zeros(len(self.players))
+        
+        for player, p_total in zip(players, p_totals):
+            # 退屈圧力の更新
+            if p_total < 0.3:
+                player.boredom_turns += 1
+                player.boredom_pressure = 1.0 + 0.1 * player.boredom_turns
+                
+                if player.boredom_pressure > 2.0:
+                    self.log_event(f"    💤 {player.name} が退屈から発言")
+                    player.statement_count += 1
+                    player.boredom_turns = 0
+                    player.boredom_pressure = 0.0
+                    delta_d[self.name_to_idx[player.name]] -= 5.0  # 発言コスト
+            else:
                 player.boredom_turns = 0
                 player.boredom_pressure = 0.0
-                player.state.E_direct -= 5.0  # 発言コスト
-        else:
-            player.boredom_turns = 0
-            player.boredom_pressure = 0.0
-        
-        # v6: 連成SSDエンジンでステップ実行
-        player.state = player.engine.step(
-            state=player.state,
-            p_external=p_external_vector,
-            dt=1.0
-        )
+        self.apply_energy_delta(delta_d)
         
-        # 相転移チェック
-        self.handle_phase_transition(player)
+        # v6: 連成SSDエンジンで全員分のステップを一括実行
+        # （全員のステップ後に相転移を処理するため、パニックによる疑惑の増加は
+        #   同じ日の他プレイヤーのステップには影響せず翌日の意味圧から反映される）
+        is_critical = self.step_engines(players, pressures)
+        
+        # 相転移チェック（臨界状態のプレイヤーのみ処理）
+        for k in np.flatnonzero(is_critical):
+            self.handle_phase_transition(players[k])
+    
+    def step_engines(self, players: List[WerewolfPlayerV6], pressures: np.ndarray,
+                     dt: float = 1.0) -> np.ndarray:
+        """v6: 各プレイヤーのSSDCoreEngineV3_5.stepをstep_batchedでまとめて実行（戻り値: 臨界マスク）"""
+        return step_batched([p.engine for p in players], [p.state for p in players], pressures, dt)
     
     def day_phase(self):
         """昼フェーズ"""
         self.day += 1
-        print(f"\n  === Day {self.day}: 昼フェーズ ===")
+        if self.verbosity:
+            print(f"\n  === Day {self.day}: 昼フェーズ ===")
         
-        alive = [p for p in self.players if p.alive]
+        alive = self.alive_list
+        pressures = self.calculate_pressures()
+        self._transition_draws = self.rng.random_array((len(self.players), _MAX_TRANSITIONS))
         
-        for player in alive:
-            self.update_player_energy(player)
+        alive_idx = [self.name_to_idx[p.name] for p in alive]
+        self.update_player_energy(alive, pressures[alive_idx])
         
         self.discussion_phase()
         executed = self.voting_phase()
         
         if executed:
-            executed.alive = False
-            self.log_event(f"  💀 {executed.name}({executed.persona.value}) が処刑 ({executed.role})")
+            self.kill_player(executed)
+            self.event_log.append(("execute", "村", executed.name))
+            self.log_event(f"  💀 {executed.name}({executed.persona_label}) が処刑 ({executed.role})")
             self.learning_phase(executed)
     
     def night_phase(self):
         """夜フェーズ（v6: E_direct消費）"""
-        print(f"  === Day {self.day}: 夜のフェーズ ===")
+        if self.verbosity:
+            print(f"  === Day {self.day}: 夜のフェーズ ===")
         
-        werewolves = [p for p in self.players if p.alive and p.role == "WEREWOLF"]
+        werewolves = [p for p in self.alive_list if p.role == "WEREWOLF"]
         if not werewolves:
             return
         
-        wolf = random.choice(werewolves)
-        targets = [p for p in self.players if p.alive and p.role != "WEREWOLF"]
+        wolf = self.rng.choice(werewolves)
+        targets = [p for p in self.alive_list if p.role != "WEREWOLF"]
         
         if targets:
             strategy_query = self.query_strategy_db(wolf)
             
             if strategy_query and strategy_query.strategy:
-                if strategy_query.strategy.action_type == "TARGET_ALLIANCE":
-                    target = max(targets, key=lambda p: 
-                               sum(p.trust_map.get(other.name, 0) for other in self.players if other.alive))
+                if strategy_query.strategy.action_type == ActionType.TARGET_ALLIANCE:
+                    # 各村人が生存者へ向ける信頼度の総和が最大の相手を狙う
+                    ally_strength = np.where(self.alive_mask[None, :] & self._not_self,
+                                             self.trust_mat, 0.0).sum(axis=1)
+                    target = max(targets, key=lambda p: ally_strength[self.name_to_idx[p.name]])
                 else:
-                    target = random.choice(targets)
+                    target = self.rng.choice(targets)
             else:
-                target = random.choice(targets)
+                target = self.rng.choice(targets)
             
             attack_cost = 30.0 if wolf.state.E_direct >= 30 else 10.0
             wolf.state.E_direct -= attack_cost
             
             if attack_cost >= 30:
-                target.alive = False
+                self.kill_player(target)
+                self.event_log.append(("attack", wolf.name, target.name))
                 self.log_event(f"  🌙 {wolf.name} が {target.name} を襲撃")
             else:
                 self.log_event(f"  🌙 {wolf.name} が {target.name} を弱い襲撃")
         
-        seer = next((p for p in self.players if p.alive and p.role == "SEER"), None)
-        if seer:
-            divination_targets = [p for p in self.players if p.alive and p.name != seer.name]
+        seer = self.players[self.seer_idx] if self.seer_idx is not None else None
+        if seer and seer.alive:
+            divination_targets = [p for p in self.alive_list if p.name != seer.name]
             if divination_targets:
-                target = random.choice(divination_targets)
+                target = self.rng.choice(divination_targets)
                 seer.state.E_indirect -= 15.0
                 result = "人狼" if target.role == "WEREWOLF" else "村人"
                 self.log_event(f"  🔮 {seer.name} が {target.name} を占い → {result}")
@@ -812,40 +1029,49 @@ class WerewolfGameV6:
                     target.suspicion_level += 5.0
     
     def check_game_end(self) -> Optional[str]:
-        """ゲーム終了判定"""
-        alive = [p for p in self.players if p.alive]
-        werewolves = [p for p in alive if p.role == "WEREWOLF"]
-        villagers = [p for p in alive if p.role != "WEREWOLF"]
-        
-        if len(werewolves) == 0:
+        """ゲーム終了判定（kill_playerが維持する生存者数のみ参照: O(1)）"""
+        if self.n_werewolves_alive == 0:
             return "村人側の勝利"
-        if len(werewolves) >= len(villagers):
+        if self.n_werewolves_alive >= self.n_villagers_alive:
             return "人狼側の勝利"
         return None
     
-    def run(self):
-        """ゲーム実行"""
+    def run(self, quick_plot: bool = False, render_pool=None,
+            path: str = 'ssd_werewolf_game_v6.png') -> Optional[str]:
+        """ゲーム実行（戻り値: 勝敗結果, 決着しなければNone。quick_plotで軽量グラフ）
+        
+        render_poolを渡すとverbosityに関わらず描画を投げ、Futureをself.render_futureに保持する
+        （スイープではpathをゲーム毎に変え、プール終了前にrender_future.result()で完了を待つ）。
+        """
         self.setup_game()
-        print("\n[ゲーム開始]")
+        if self.verbosity:
+            print("\n[ゲーム開始]")
         
         max_days = 10
-        for _ in range(max_days):
-            self.day_phase()
-            
-            result = self.check_game_end()
-            if result:
-                print(f"  🏆 ゲーム終了: {result}")
-                break
-            
-            self.night_phase()
-            
-            result = self.check_game_end()
-            if result:
-                print(f"  🏆 ゲーム終了: {result}")
+        phases = (self.day_phase, self.night_phase)
+        # 昼→夜をmax_days回並べた単一ループ（各フェーズ後の判定は1箇所のみ）
+        for phase in itertools.chain.from_iterable(itertools.repeat(phases, max_days)):
+            phase()
+            if self._maybe_end():
                 break
         
-        self.print_final_report()
-        self.visualize_v6()
+        if self.verbosity:
+            self.print_final_report()
+        if render_pool is not None:
+            self.render_future = self.visualize_v6(quick=quick_plot, render_pool=render_pool,
+                                                   path=path)
+        elif self.verbosity:
+            self.visualize_v6(quick=quick_plot, path=path)
+        return self.result
+    
+    def _maybe_end(self) -> bool:
+        """フェーズ後の決着判定（決着時は結果を記録して表示）"""
+        self.result = self.check_game_end()
+        if self.result is None:
+            return False
+        if self.verbosity:
+            print(f"  🏆 ゲーム終了: {self.result}")
+        return True
     
     def print_final_report(self):
         """最終レポート"""
@@ -853,12 +1079,12 @@ class WerewolfGameV6:
         print("📊 v6.0 最終結果")
         print("=" * 70)
         
-        alive = [p for p in self.players if p.alive]
+        alive = self.alive_list
         dead = [p for p in self.players if not p.alive]
         
         print("\n[生存者]")
         for p in alive:
-            print(f"  {p.name} ({p.role} / {p.persona.value})")
+            print(f"  {p.name} ({p.role} / {p.persona_label})")
             print(f"    E_direct: {p.state.E_direct:.1f}, E_indirect: {p.state.E_indirect:.1f}, "
                   f"kappa: {p.state.kappa:.2f}")
             print(f"    思考: {p.simulations_performed}回, 戦略使用: {len(p.strategies_used)}回")
@@ -870,112 +1096,129 @@ class WerewolfGameV6:
                 print(f"    ペルソナ変異: {p.persona_transitions}回")
         
         print("\n[犠牲者]")
+        cause_by_name = {target: kind for kind, _, target in self.event_log}
         for p in dead:
-            cause = "処刑" if any(e for e in self.events if f"{p.name}({p.persona.value}) が処刑" in e) else "襲撃"
-            print(f"  {p.name} ({p.role} / {p.persona.value}) - {cause}")
+            cause = "処刑" if cause_by_name.get(p.name) == "execute" else "襲撃"
+            print(f"  {p.name} ({p.role} / {p.persona_label}) - {cause}")
         
+        stats = self.player_stats()
         print("\n[統計]")
         print(f"  相転移: {self.phase_transitions}回")
-        print(f"  発言: {sum(p.statement_count for p in self.players)}回")
-        print(f"  思考: {sum(p.simulations_performed for p in self.players)}回")
+        print(f"  発言: {int(stats['statements'].sum())}回")
+        print(f"  思考: {int(stats['simulations'].sum())}回")
         print(f"  戦略参照: {self.total_strategies_invoked}回")
         print(f"  認知的不協和: {self.total_cognitive_conflicts}回")
-        print(f"  ペルソナ変異: {sum(p.persona_transitions for p in self.players)}回")
+        print(f"  ペルソナ変異: {int(stats['persona_transitions'].sum())}回")
         print(f"  ルールブレイク: {self.total_rulebreaks}回")
     
-    def visualize_v6(self):
-        """可視化（v6: 認知的不協和グラフ追加）"""
-        fig, axes = plt.subplots(3, 3, figsize=(18, 14))
+    def player_stats(self) -> np.ndarray:
+        """全プレイヤーの統計を1パスで構造化配列へ収集"""
+        return np.fromiter(
+            ((p.state.E_direct, p.state.E_indirect, p.state.kappa, p.suspicion_level,
+              p.statement_count, p.simulations_performed, len(p.strategies_used),
+              p.cognitive_conflicts, p.thought_priority_decisions, p.strategy_priority_decisions,
+              p.persona_transitions)
+             for p in self.players),
+            dtype=_PLAYER_STATS_DTYPE, count=len(self.players))
+    
+    def snapshot(self) -> Dict[str, object]:
+        """描画に必要な値だけを持つスナップショット（プロセス間で受け渡し可能）"""
+        return {
+            'names': self._player_names,
+            'colors': self._plot_colors,
+            'stats': self.player_stats(),
+        }
+    
+    def visualize_v6(self, quick: bool = False, render_pool=None,
+                     path: str = 'ssd_werewolf_game_v6.png'):
+        """可視化（v6: 認知的不協和グラフ追加。quick=Trueは主要6パネルの軽量版）
+        
+        render_pool（concurrent.futures.Executor）を渡すと描画をワーカーへ投げて
+        Futureを返す（スイープ中に次のゲームと並行して描画。pathはゲーム毎に変えること）。
+        """
+        if render_pool is not None:
+            return render_pool.submit(render_report, self.snapshot(), path, quick)
+        render_report(self.snapshot(), path, quick, show=True)
+        print(f"\n💾 グラフ保存: {path}")
+
+
+def render_report(snapshot: Dict[str, object], out_path: str,
+                  quick: bool = False, show: bool = False):
+    """v6レポート図の描画（ゲーム状態に依存しない純粋関数: ワーカープロセスから呼び出し可能）"""
+    if quick:
+        panels = [spec for spec in _V6_BAR_PANELS if spec[0] in _V6_QUICK_PANELS]
+        rc = {'path.simplify_threshold': 1.0}
+        layout, figsize = (2, 3), (12, 8)
+    else:
+        panels, rc = _V6_BAR_PANELS, {}
+        layout, figsize = (3, 3), (18, 14)
+    
+    with plt.rc_context(rc):
+        # 全パネルがプレイヤー軸を共有（目盛りは1回だけ設定し最下段のみ表示）
+        fig, axes = plt.subplots(*layout, figsize=figsize, sharex=True)
         fig.suptitle('SSD v6.0: Werewolf Game with Integrated Cognition', 
                      fontsize=16, fontweight='bold')
         
-        colors = plt.cm.tab10(np.linspace(0, 1, len(self.players)))
-        
-        # グラフ1-6: 既存
-        for idx, player in enumerate(self.players):
-            e_direct_history = [player.state.E_direct]  # 簡略化: 最終値のみ
-            axes[0, 0].bar(player.name, player.state.E_direct, color=colors[idx])
-        axes[0, 0].set_title('E_direct (行動エネルギー) 最終値', fontweight='bold')
-        axes[0, 0].set_ylabel('Energy')
-        axes[0, 0].tick_params(axis='x', rotation=45)
-        axes[0, 0].grid(True, alpha=0.3, axis='y')
-        
-        for idx, player in enumerate(self.players):
-            axes[0, 1].bar(player.name, player.state.E_indirect, color=colors[idx])
-        axes[0, 1].set_title('E_indirect (思考エネルギー) 最終値', fontweight='bold')
-        axes[0, 1].set_ylabel('Energy')
-        axes[0, 1].tick_params(axis='x', rotation=45)
-        axes[0, 1].grid(True, alpha=0.3, axis='y')
-        
-        for idx, player in enumerate(self.players):
-            theta = player.state.E_direct + player.state.E_indirect
-            axes[0, 2].bar(player.name, theta, color=colors[idx])
-        axes[0, 2].set_title('Theta (総エネルギー) 最終値', fontweight='bold')
-        axes[0, 2].set_ylabel('Energy')
-        axes[0, 2].tick_params(axis='x', rotation=45)
-        axes[0, 2].grid(True, alpha=0.3, axis='y')
-        
-        kappa_data = [p.state.kappa for p in self.players]
-        axes[1, 0].bar([p.name for p in self.players], kappa_data, color=colors)
-        axes[1, 0].set_title('Kappa (整合慣性) 最終値', fontweight='bold')
-        axes[1, 0].set_ylabel('Kappa')
-        axes[1, 0].tick_params(axis='x', rotation=45)
-        axes[1, 0].grid(True, alpha=0.3, axis='y')
-        
-        suspicion_data = [p.suspicion_level for p in self.players]
-        axes[1, 1].bar([p.name for p in self.players], suspicion_data, color=colors)
-        axes[1, 1].set_title('疑惑レベル (最終)', fontweight='bold')
-        axes[1, 1].set_ylabel('Suspicion Level')
-        axes[1, 1].tick_params(axis='x', rotation=45)
-        axes[1, 1].grid(True, alpha=0.3, axis='y')
-        
-        statement_data = [p.statement_count for p in self.players]
-        axes[1, 2].bar([p.name for p in self.players], statement_data, color=colors)
-        axes[1, 2].set_title('発言回数', fontweight='bold')
-        axes[1, 2].set_ylabel('Statements')
-        axes[1, 2].tick_params(axis='x', rotation=45)
-        axes[1, 2].grid(True, alpha=0.3, axis='y')
-        
-        # v6新規グラフ (7-9)
-        simulation_data = [p.simulations_performed for p in self.players]
-        axes[2, 0].bar([p.name for p in self.players], simulation_data, color=colors)
-        axes[2, 0].set_title('思考シミュレーション回数', fontweight='bold')
-        axes[2, 0].set_ylabel('Simulations')
-        axes[2, 0].tick_params(axis='x', rotation=45)
-        axes[2, 0].grid(True, alpha=0.3, axis='y')
-        
-        strategy_data = [len(p.strategies_used) for p in self.players]
-        axes[2, 1].bar([p.name for p in self.players], strategy_data, color=colors)
-        axes[2, 1].set_title('戦略参照回数', fontweight='bold')
-        axes[2, 1].set_ylabel('Strategy Uses')
-        axes[2, 1].tick_params(axis='x', rotation=45)
-        axes[2, 1].grid(True, alpha=0.3, axis='y')
-        
-        # v6: 認知的不協和グラフ
-        conflict_data = [p.cognitive_conflicts for p in self.players]
-        thought_priority = [p.thought_priority_decisions for p in self.players]
-        strategy_priority = [p.strategy_priority_decisions for p in self.players]
-        x = np.arange(len(self.players))
+        colors = snapshot['colors']
+        names = snapshot['names']
+        stats = snapshot['stats']
+        columns = {key: stats[key] for key in stats.dtype.names}
+        columns['theta'] = stats['E_direct'] + stats['E_indirect']
+        x = np.arange(len(names))
+        
+        # 棒グラフパネル（各パネル1回のbar呼び出しで全員分を描画）
+        axes_flat = axes.flat
+        for (key, title, ylabel), ax in zip(panels, axes_flat):
+            ax.bar(x, columns[key], color=colors)
+            ax.set_title(title, fontweight='bold')
+            ax.set_ylabel(ylabel)
+            ax.grid(True, alpha=0.3, axis='y')
+        
+        # v6: 認知的不協和グラフ（最後の枠）
+        # 認知的不協和 / 思考優先決定 / 戦略優先決定 の3列を統計配列から直接参照
+        ax = next(axes_flat)
         width = 0.25
-        axes[2, 2].bar(x - width, conflict_data, width, label='認知的不協和', color='orange')
-        axes[2, 2].bar(x, thought_priority, width, label='思考優先決定', color='skyblue')
-        axes[2, 2].bar(x + width, strategy_priority, width, label='戦略優先決定', color='salmon')
-        axes[2, 2].set_title('認知的不協和統計', fontweight='bold')
-        axes[2, 2].set_ylabel('Count')
-        axes[2, 2].set_xticks(x)
-        axes[2, 2].set_xticklabels([p.name for p in self.players], rotation=45)
-        axes[2, 2].legend()
-        axes[2, 2].grid(True, alpha=0.3, axis='y')
-        
-        plt.tight_layout()
-        plt.savefig('ssd_werewolf_game_v6.png', dpi=150, bbox_inches='tight')
-        print("\n💾 グラフ保存: ssd_werewolf_game_v6.png")
+        for key, label, color, offset in zip(('conflicts', 'thought_priority', 'strategy_priority'),
+                                             ('認知的不協和', '思考優先決定', '戦略優先決定'),
+                                             ('orange', 'skyblue', 'salmon'),
+                                             (-width, 0.0, width)):
+            ax.bar(x + offset, stats[key], width, label=label, color=color)
+        ax.set_title('認知的不協和統計', fontweight='bold')
+        ax.set_ylabel('Count')
+        ax.legend()
+        ax.grid(True, alpha=0.3, axis='y')
+        
+        # x目盛り（sharexで全パネルへ伝播）
+        axes[-1, 0].set_xticks(x)
+        axes[-1, 0].set_xticklabels(names)
+        for ax in axes[-1]:
+            ax.tick_params(axis='x', rotation=45)
+        
+        fig.tight_layout()
+        if quick:
+            # 低DPI・bbox計測なし（2回目の全描画を省略）
+            fig.savefig(out_path, dpi=100)
+        else:
+            fig.savefig(out_path, dpi=150, bbox_inches='tight')
+    if show and matplotlib.get_backend().lower() != 'agg':
         plt.show()
+    plt.close(fig)  # 連続実行時に図のメモリを解放
+
+
+def use_headless_backend_if_needed():
+    """画面のないLinux環境（バッチ実行・SSH）ではAggで描画しファイル保存のみ行う
+    
+    import時にはバックエンドを変更しない（呼び出し側の設定を尊重し、スクリプト実行時のみ呼ぶ）。
+    """
+    if (sys.platform.startswith('linux') and 'MPLBACKEND' not in os.environ
+            and not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY')):
+        matplotlib.use('Agg')
 
 # ========== メイン実行 ==========
 if __name__ == "__main__":
+    use_headless_backend_if_needed()
     game = WerewolfGameV6()
-    game.run()
+    game.run(quick_plot="--quick" in sys.argv)
     
     print("\n" + "=" * 70)
     print("✅ v6.0デモ完了")
@@ -30,18 +30,25 @@ v7: SSD人間モジュール四層構造への統合
 """
 
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import List, Dict, Tuple, Optional, Callable
 import random
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 
+from ssd_numba_compat import njit  # Numba未導入環境ではPython実装のまま実行
+
+# dataclassのslots指定はPython 3.10以降のみ対応（それ以前は通常の__dict__で動作）
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 # ========== SSD v3.5コアエンジン（完全版）インポート ==========
 from ssd_core_engine_v3_5 import (
     SSDCoreEngineV3_5,
     SSDStateV3_5,
     SSDParametersV3_5,
-    SSDDomain
+    SSDDomain,
+    step_batched
 )
 
 # ========== [v7新機能] 四層構造多次元意味圧システム ==========
@@ -49,6 +56,7 @@ from ssd_multidimensional_pressure_v2 import (
     MultiDimensionalPressure,
     PressureDimension,
     SSDLayer,
+    LAYER_CONFLICT_LABELS,
     create_apex_survivor_pressure_v2
 )
 
@@ -59,6 +67,12 @@ class Persona(Enum):
     LEADER = "リーダー型"
     DISRUPTOR = "攪乱型"
 
+class Role(IntEnum):
+    """役職コード（圧力カーネルの役職列と同じ値）"""
+    WEREWOLF = 0
+    SEER = 1
+    VILLAGER = 2
+
 @dataclass
 class PersonaTransition:
     """ペルソナ変異ルール（上層構造の跳躍）"""
@@ -78,56 +92,109 @@ PERSONA_TRANSITIONS = [
     PersonaTransition(Persona.DISRUPTOR, Persona.STEALTH, 0.35, "静かになった"),
 ]
 
+# 変異候補表（キー: (変異元, 本能的変異か)）。優先方向の変異が無ければ変異元の全変異が候補。
+# 値は (累積しきい値, 変異) の列: 候補の一様選択と変異確率による受理を1回の抽選u<しきい値にまとめたもの
+_INSTINCTIVE_TARGETS = (Persona.STEALTH, Persona.DISRUPTOR)   # BASE層優勢時
+_IDEOLOGICAL_TARGETS = (Persona.LEADER, Persona.AGGRESSIVE)   # UPPER層優勢時
+
+def _transition_candidates(persona: Persona, targets: Tuple[Persona, ...]) -> Tuple[Tuple[float, PersonaTransition], ...]:
+    applicable = tuple(t for t in PERSONA_TRANSITIONS if t.from_persona == persona)
+    candidates = tuple(t for t in applicable if t.to_persona in targets) or applicable
+    thresholds = np.cumsum([t.probability for t in candidates]) / max(len(candidates), 1)
+    return tuple(zip(thresholds.tolist(), candidates))
+
+_TRANSITION_CANDIDATES: Dict[Tuple[Persona, bool], Tuple[Tuple[float, PersonaTransition], ...]] = {
+    (persona, instinctive): _transition_candidates(
+        persona, _INSTINCTIVE_TARGETS if instinctive else _IDEOLOGICAL_TARGETS)
+    for persona in Persona for instinctive in (True, False)
+}
+
 # ========== v6継承: 戦略データベース（中核構造） ==========
 @dataclass
 class GameStrategy:
-    """人狼ゲームの定石知識"""
+    """人狼ゲームの定石知識（発動条件は述語テーブルとして宣言）"""
     name: str
-    condition: callable
     action_type: str
     priority: float
     description: str
     energy_cost: float = 15.0
+    # 発動条件（全て満たした場合に適用）
+    werewolf_only: bool = False           # 人狼のみ
+    min_day: int = 0                      # day >= min_day
+    max_day: int = 10**9                  # day <= max_day
+    requires_seer_revealed: bool = False  # 占い師の人狼判定が出ている
+    requires_parity: bool = False         # 人狼生存数 == 村人生存数
+    suspicion_above: float = -np.inf      # 疑惑レベル > suspicion_above
+    villagers_above: int = -1             # 村人生存数 > villagers_above
 
 STRATEGY_DB: List[GameStrategy] = [
     GameStrategy(
         name="SEER_CO_DEFENSE",
-        condition=lambda ctx: ctx.get('seer_revealed') and ctx.get('role') == 'WEREWOLF',
         action_type="COUNTER_CO",
         priority=10.0,
         description="占い師COには対抗COせよ",
-        energy_cost=25.0
+        energy_cost=25.0,
+        werewolf_only=True,
+        requires_seer_revealed=True
     ),
     GameStrategy(
         name="FINAL_DAY_PP",
-        condition=lambda ctx: ctx.get('day') >= 3 and ctx.get('werewolves_alive') == ctx.get('villagers_alive'),
         action_type="FORM_PP",
         priority=9.0,
-        description="最終日は信頼者と組みPPを狙え"
+        description="最終日は信頼者と組みPPを狙え",
+        min_day=3,
+        requires_parity=True
     ),
     GameStrategy(
         name="EARLY_SILENCE",
-        condition=lambda ctx: ctx.get('day') == 1 and ctx.get('role') == 'WEREWOLF',
         action_type="MINIMIZE_STATEMENTS",
         priority=7.0,
-        description="序盤は情報を与えるな"
+        description="序盤は情報を与えるな",
+        werewolf_only=True,
+        min_day=1,
+        max_day=1
     ),
     GameStrategy(
         name="TRUST_BUILDING",
-        condition=lambda ctx: ctx.get('suspicion_level', 0) > 5.0,
         action_type="COOPERATIVE_VOTE",
         priority=6.0,
-        description="疑われたら協調行動で信頼回復"
+        description="疑われたら協調行動で信頼回復",
+        suspicion_above=5.0
     ),
     GameStrategy(
         name="DIVIDE_CONQUER",
-        condition=lambda ctx: ctx.get('role') == 'WEREWOLF' and ctx.get('villagers_alive') > 3,
         action_type="TARGET_ALLIANCE",
         priority=5.0,
-        description="村人同盟を分断せよ"
+        description="村人同盟を分断せよ",
+        werewolf_only=True,
+        villagers_above=3
     ),
 ]
 
+# 戦略DBの述語テーブル（列=STRATEGY_DBの並び）
+def _strategy_column(attr: str, dtype) -> np.ndarray:
+    return np.fromiter((getattr(s, attr) for s in STRATEGY_DB), dtype=dtype, count=len(STRATEGY_DB))
+
+_STRATEGY_WEREWOLF_ONLY = _strategy_column('werewolf_only', np.bool_)
+_STRATEGY_MIN_DAY = _strategy_column('min_day', np.int64)
+_STRATEGY_MAX_DAY = _strategy_column('max_day', np.int64)
+_STRATEGY_REQUIRES_SEER = _strategy_column('requires_seer_revealed', np.bool_)
+_STRATEGY_REQUIRES_PARITY = _strategy_column('requires_parity', np.bool_)
+_STRATEGY_SUSPICION_ABOVE = _strategy_column('suspicion_above', np.float64)
+_STRATEGY_VILLAGERS_ABOVE = _strategy_column('villagers_above', np.int64)
+_STRATEGY_PRIORITY = _strategy_column('priority', np.float64)
+
+def evaluate_strategies(day: int, is_werewolf: bool, seer_revealed: bool,
+                        suspicion_level: float, werewolves_alive: int,
+                        villagers_alive: int) -> np.ndarray:
+    """戦略DBの発動条件を一括評価（戻り値: STRATEGY_DB順の適用可否マスク）"""
+    return ((day >= _STRATEGY_MIN_DAY) & (day <= _STRATEGY_MAX_DAY)
+            & (is_werewolf | ~_STRATEGY_WEREWOLF_ONLY)
+            & (seer_revealed | ~_STRATEGY_REQUIRES_SEER)
+            & ((werewolves_alive == villagers_alive) | ~_STRATEGY_REQUIRES_PARITY)
+            & (suspicion_level > _STRATEGY_SUSPICION_ABOVE)
+            & (villagers_alive > _STRATEGY_VILLAGERS_ABOVE))
+
 # ========== v6継承: ルールブレイク（中核構造への跳躍） ==========
 class RuleBreakType(Enum):
     VOTE_BOYCOTT = "投票棄権"
@@ -163,8 +230,19 @@ RULEBREAK_ACTIONS = [
     ),
 ]
 
+# ペルソナ別のルールブレイク候補（閾値の降順: 閾値を超えた候補は常に末尾側の連続区間になる）
+RULEBREAK_BY_PERSONA: Dict[Persona, Tuple[RuleBreakAction, ...]] = {
+    persona: tuple(sorted((rb for rb in RULEBREAK_ACTIONS if rb.persona_requirement == persona),
+                          key=lambda rb: -rb.trigger_threshold))
+    for persona in Persona
+}
+_RULEBREAK_THRESHOLDS: Dict[Persona, np.ndarray] = {
+    persona: np.array([rb.trigger_threshold for rb in actions])
+    for persona, actions in RULEBREAK_BY_PERSONA.items()
+}
+
 # ========== v6継承: 階層的認知モデル ==========
-@dataclass
+@dataclass(eq=False, **_SLOTS)
 class ThoughtSimulation:
     """内的シミュレーション結果（第二階層）"""
     target: str
@@ -172,14 +250,14 @@ class ThoughtSimulation:
     predicted_trust_impact: float
     energy_cost: float = 20.0
 
-@dataclass
+@dataclass(eq=False, **_SLOTS)
 class StrategyQuery:
     """戦略DB参照結果（第一階層）"""
     strategy: Optional[GameStrategy]
     confidence: float
     energy_cost: float = 15.0
 
-@dataclass
+@dataclass(eq=False, **_SLOTS)
 class CognitiveConflict:
     """認知的不協和（第一階層と第二階層の葛藤）"""
     strategy_suggestion: str  # 戦略DBの提案
@@ -189,7 +267,7 @@ class CognitiveConflict:
     final_decision: str      # 最終決定
 
 # ========== [v7新機能] 四層構造統計データ ==========
-@dataclass
+@dataclass(eq=False, **_SLOTS)
 class LayerConflictEvent:
     """層間葛藤イベント"""
     day: int
@@ -199,18 +277,111 @@ class LayerConflictEvent:
     conflict_index: float
     decision: str
 
+# ========== [v7核心機能] 四層構造圧力次元（列順=compute_pressure_values の出力順） ==========
+# (次元名, 作用層, 重み, 説明)
+PRESSURE_DIMENSIONS_V7 = (
+    # --- PHYSICAL層: 物理的制約（R→∞） ---
+    ('physical_constraint', SSDLayer.PHYSICAL, 1.0, '発言制限・時間制約（物理層）'),
+    # --- BASE層: 本能・生存・恐怖（R=large） ---
+    ('survival_instinct', SSDLayer.BASE, 0.6, '生存本能（疑惑恐怖）（基層）'),
+    ('risk_avoidance', SSDLayer.BASE, 0.4, 'リスク回避本能（基層）'),
+    # --- CORE層: ルール・社会・役割（R=medium） ---
+    ('role_performance', SSDLayer.CORE, 0.5, '役割遂行圧力（中核層）'),
+    ('trust_system', SSDLayer.CORE, 0.5, '信頼システム圧力（中核層）'),
+    # --- UPPER層: 意味・文脈・理念（R=small） ---
+    ('strategic_narrative', SSDLayer.UPPER, 0.6, '戦略的物語圧力（上層）'),
+    ('ideological_pressure', SSDLayer.UPPER, 0.4, '理念圧力（上層）'),
+)
+
+# カーネル入力の特徴量列とコード
+FEAT_STATEMENTS, FEAT_SUSPICION, FEAT_ACCUSERS, FEAT_ALLIES, \
+    FEAT_WEREWOLVES_ALIVE, FEAT_DAY, FEAT_ROLE, FEAT_PERSONA = range(8)
+_PERSONA_CODE = {persona: i for i, persona in enumerate(Persona)}
+
+# 層別圧力配列（calculate_from_values(as_array=True)の戻り値）の列: SSDLayerの定義順
+_LAYER_NAMES = tuple(layer.name for layer in SSDLayer)
+LAYER_PHYSICAL = _LAYER_NAMES.index(SSDLayer.PHYSICAL.name)
+LAYER_BASE = _LAYER_NAMES.index(SSDLayer.BASE.name)
+LAYER_CORE = _LAYER_NAMES.index(SSDLayer.CORE.name)
+LAYER_UPPER = _LAYER_NAMES.index(SSDLayer.UPPER.name)
+
+@njit(cache=True)
+def max_layer_conflict(p):
+    """
+    層別圧力配列pから最大の層間葛藤を求める（戻り値: (LAYER_CONFLICT_LABELSの添字, 葛藤指数)）
+    
+    MultiDimensionalPressure.get_layer_conflict_arrayのargmaxと同じ。同値なら先のペアを優先。
+    """
+    physical_suppression = 1.0 - p[LAYER_PHYSICAL]
+    best = 0
+    best_value = p[LAYER_BASE] * p[LAYER_UPPER] * physical_suppression
+    value = p[LAYER_BASE] * p[LAYER_CORE] * physical_suppression
+    if value > best_value:
+        best, best_value = 1, value
+    value = p[LAYER_CORE] * p[LAYER_UPPER] * physical_suppression
+    if value > best_value:
+        best, best_value = 2, value
+    return best, best_value
+
+# ペルソナ別の思考確率（persona_idで引く: Personaの定義順）
+_THINK_PROB = (0.3, 0.5, 0.8, 0.4)  # STEALTH, AGGRESSIVE, LEADER, DISRUPTOR
+
+# 役職別の初期ペルソナ候補（占い師は常にLEADER）
+_WEREWOLF_PERSONAS = (Persona.STEALTH, Persona.STEALTH, Persona.AGGRESSIVE)
+_VILLAGER_PERSONAS = (Persona.STEALTH, Persona.AGGRESSIVE, Persona.LEADER, Persona.DISRUPTOR)
+
+# 1日分まとめて生成する一様乱数[0, 1)の列（プレイヤー1ターン分）
+DRAW_THINK, DRAW_TARGET, DRAW_PRED_SUSPICION, DRAW_PRED_TRUST, DRAW_RULEBREAK, \
+    DRAW_TRANSITION, DRAW_TRANSITION_PICK, DRAW_SUSPICION = range(8)
+_N_DRAWS = 8
+
+@njit(cache=True)
+def compute_pressure_values(feats, out):
+    """
+    全プレイヤーの四層構造圧力次元値を一括計算
+    
+    feats[k] = [発言回数, 疑惑レベル, 告発者数, 味方数, 人狼生存数, 日数, 役割コード, ペルソナコード]
+    out[k] に PRESSURE_DIMENSIONS_V7 の順で次元値を書き込む。
+    """
+    for k in range(feats.shape[0]):
+        statements = feats[k, 0]
+        suspicion = feats[k, 1]
+        role = feats[k, 6]
+        persona = feats[k, 7]
+        
+        # PHYSICAL: 発言回数が制限(12回)に近づくほど圧力増加
+        out[k, 0] = min(1.0, statements / 12.0)
+        # BASE: 疑惑レベルが高いほど生存本能が高まる / 告発者が多いほどリスク圧増加
+        out[k, 1] = min(1.0, suspicion / 10.0)
+        out[k, 2] = min(1.0, feats[k, 2] / 4.0)
+        # CORE: 役割遂行（人狼=生存者数, 占い師=情報提供度, 村人=疑惑度）/ 信頼システム
+        if role == 0:  # Role.WEREWOLF
+            out[k, 3] = max(0.0, 1.0 - feats[k, 4] / 2.0)
+        elif role == 1:  # Role.SEER
+            out[k, 3] = max(0.0, 1.0 - statements / 8.0)
+        else:
+            out[k, 3] = min(1.0, suspicion / 8.0)
+        out[k, 4] = max(0.0, 1.0 - feats[k, 3] / 3.0)
+        # UPPER: 長期的戦略の必要性（日数に応じて増加）/ ペルソナに応じた理念圧力
+        out[k, 5] = min(1.0, feats[k, 5] / 4.0)
+        if persona == 2:    # LEADER: 理念を強く感じる
+            out[k, 6] = 0.7
+        elif persona == 3:  # DISRUPTOR: 理念から解放されている
+            out[k, 6] = 0.2
+        else:
+            out[k, 6] = 0.4
+
 # ========== プレイヤークラス（v7完全版） ==========
-@dataclass
+@dataclass(eq=False, **_SLOTS)
 class WerewolfPlayerV7:
     name: str
-    role: str
+    role: str  # ログ表示用（判定はrole_idで行う）
     engine: SSDCoreEngineV3_5
     state: SSDStateV3_5
     pressure_system: MultiDimensionalPressure
     persona: Persona
     alive: bool = True
     suspicion_level: float = 0.0
-    trust_map: Dict[str, float] = field(default_factory=dict)
     statement_count: int = 0
     boredom_turns: int = 0
     boredom_pressure: float = 0.0
@@ -227,97 +398,51 @@ class WerewolfPlayerV7:
     base_leaps: int = 0  # BASE層由来の跳躍回数
     upper_leaps: int = 0  # UPPER層由来の跳躍回数
     physical_constraints: int = 0  # PHYSICAL層制約回数
+    
+    # 役職・ペルソナの整数コード（ペルソナ変更はset_persona経由）
+    role_id: int = field(init=False)
+    persona_id: int = field(init=False)
+    
+    def __post_init__(self):
+        self.role_id = Role[self.role]
+        self.persona_id = _PERSONA_CODE[self.persona]
 
 # ========== ゲームマスター（v7完全版） ==========
 class WerewolfGameV7:
-    def __init__(self):
+    def __init__(self, verbosity: int = 1):
+        self.verbosity = verbosity  # 0: 途中経過を出力しない（最終統計のみ）
         self.players: List[WerewolfPlayerV7] = []
         self.day = 0
         self.phase_transitions = 0
         self.events = []
-        self.trust_map_global: Dict[Tuple[str, str], float] = {}
+        self._logbuf: List[str] = []  # 未出力のログ行（run_day_phaseの終わりに一括出力）
+        
+        # 信頼関係（行=評価者, 列=評価対象）と生存マスク。ペア間の信頼もtrust_mat[i, j]で表す
+        self.name_to_idx: Dict[str, int] = {}
+        self.trust_mat = np.zeros((0, 0))
+        self.alive_mask = np.zeros(0, dtype=bool)
+        self._not_self = np.zeros((0, 0), dtype=bool)
+        self._p_totals = np.zeros(0)  # 各プレイヤーの総圧力（エンジンへの外部圧, 毎日使い回す）
         self.seer_revealed = False
         self.total_strategies_invoked = 0
         self.total_rulebreaks = 0
         self.total_cognitive_conflicts = 0
         self.total_layer_conflicts = 0  # [v7] 層間葛藤総数
         
-    def log_event(self, message: str):
+    def log_event(self, message: str, *args):
+        """イベント記録（argsがあれば%書式で遅延整形。eventsには常に記録し、出力のみverbosityで抑制）"""
+        if args:
+            message = message % args
         self.events.append(f"  {message}")
-        print(f"  {message}")
-    
-    # ========== [v7核心機能] 四層構造圧力計算関数群 ==========
-    
-    def physical_constraint_calculator(self, player: WerewolfPlayerV7) -> Callable:
-        """PHYSICAL層: 発言制限・時間制約（R→∞）"""
-        max_statements = 12
-        def calc(context: dict) -> float:
-            # 発言回数が制限に近づくほど圧力増加
-            fatigue = player.statement_count / max_statements
-            return min(1.0, fatigue)
-        return calc
-    
-    def survival_instinct_calculator(self, player: WerewolfPlayerV7) -> Callable:
-        """BASE層: 生存本能（疑惑恐怖）（R=large）"""
-        def calc(context: dict) -> float:
-            # 疑惑レベルが高いほど生存本能が高まる
-            return min(1.0, player.suspicion_level / 10.0)
-        return calc
+        if self.verbosity:
+            self._logbuf.append(f"  {message}\n")
     
-    def risk_avoidance_calculator(self, player: WerewolfPlayerV7) -> Callable:
-        """BASE層: リスク回避本能（R=large）"""
-        def calc(context: dict) -> float:
-            # 告発者が多いほどリスク圧増加
-            accusers = sum(1 for p in self.players 
-                          if p.alive and p.name != player.name 
-                          and player.trust_map.get(p.name, 0.5) < 0.3)
-            return min(1.0, accusers / 4.0)
-        return calc
+    def set_persona(self, player: WerewolfPlayerV7, persona: Persona):
+        """ペルソナ変更（整数コードも同時に更新）"""
+        player.persona = persona
+        player.persona_id = _PERSONA_CODE[persona]
     
-    def role_performance_calculator(self, player: WerewolfPlayerV7) -> Callable:
-        """CORE層: 役割遂行圧力（R=medium）"""
-        def calc(context: dict) -> float:
-            # 役割に応じた遂行度
-            if player.role == "WEREWOLF":
-                # 人狼は生存者数で評価
-                werewolves = sum(1 for p in self.players if p.alive and p.role == "WEREWOLF")
-                return max(0.0, 1.0 - werewolves / 2.0)
-            elif player.role == "SEER":
-                # 占い師は情報提供度で評価
-                return max(0.0, 1.0 - player.statement_count / 8.0)
-            else:
-                # 村人は疑惑度で評価
-                return min(1.0, player.suspicion_level / 8.0)
-        return calc
-    
-    def trust_system_calculator(self, player: WerewolfPlayerV7) -> Callable:
-        """CORE層: 信頼システム圧力（R=medium）"""
-        def calc(context: dict) -> float:
-            allies = sum(1 for p in self.players 
-                        if p.alive and player.trust_map.get(p.name, 0.5) > 0.7)
-            return max(0.0, 1.0 - allies / 3.0)
-        return calc
-    
-    def strategic_narrative_calculator(self, player: WerewolfPlayerV7) -> Callable:
-        """UPPER層: 戦略的物語圧力（R=small）"""
-        def calc(context: dict) -> float:
-            # 長期的戦略の必要性（日数に応じて増加）
-            return min(1.0, self.day / 4.0)
-        return calc
-    
-    def ideological_pressure_calculator(self, player: WerewolfPlayerV7) -> Callable:
-        """UPPER層: 理念圧力（R=small）"""
-        def calc(context: dict) -> float:
-            # ペルソナに応じた理念的圧力
-            if player.persona == Persona.LEADER:
-                # リーダーは理念を強く感じる
-                return 0.7
-            elif player.persona == Persona.DISRUPTOR:
-                # 攪乱者は理念から解放されている
-                return 0.2
-            else:
-                return 0.4
-        return calc
+    # ========== [v7核心機能] 四層構造圧力計算 ==========
     
     def create_werewolf_pressure_v7(self, player: WerewolfPlayerV7) -> None:
         """
@@ -327,74 +452,53 @@ class WerewolfGameV7:
         - 各圧力が作用する層（SSDLayer）を明示的に指定
         - 層ごとに集計された圧力を取得可能
         - 層間葛藤を定量化可能
-        """
-        
-        # --- PHYSICAL層: 物理的制約（R→∞） ---
-        player.pressure_system.register_dimension(
-            name='physical_constraint',
-            calculator=self.physical_constraint_calculator(player),
-            layer=SSDLayer.PHYSICAL,
-            weight=1.0,
-            description='発言制限・時間制約（物理層）'
-        )
-        
-        # --- BASE層: 本能・生存・恐怖（R=large） ---
-        player.pressure_system.register_dimension(
-            name='survival_instinct',
-            calculator=self.survival_instinct_calculator(player),
-            layer=SSDLayer.BASE,
-            weight=0.6,
-            description='生存本能（疑惑恐怖）（基層）'
-        )
-        player.pressure_system.register_dimension(
-            name='risk_avoidance',
-            calculator=self.risk_avoidance_calculator(player),
-            layer=SSDLayer.BASE,
-            weight=0.4,
-            description='リスク回避本能（基層）'
-        )
         
-        # --- CORE層: ルール・社会・役割（R=medium） ---
-        player.pressure_system.register_dimension(
-            name='role_performance',
-            calculator=self.role_performance_calculator(player),
-            layer=SSDLayer.CORE,
-            weight=0.5,
-            description='役割遂行圧力（中核層）'
-        )
-        player.pressure_system.register_dimension(
-            name='trust_system',
-            calculator=self.trust_system_calculator(player),
-            layer=SSDLayer.CORE,
-            weight=0.5,
-            description='信頼システム圧力（中核層）'
-        )
+        次元値はcompute_pressure_valuesで全員分を一括計算するため、
+        ここでは層と重みのメタデータのみ登録する。
+        """
+        for name, layer, weight, description in PRESSURE_DIMENSIONS_V7:
+            player.pressure_system.register_dimension(
+                name=name,
+                calculator=None,
+                layer=layer,
+                weight=weight,
+                description=description
+            )
+    
+    def compute_day_pressure_values(self, alive_players: List[WerewolfPlayerV7],
+                                    werewolves_alive: int) -> np.ndarray:
+        """生存者全員の圧力次元値を一括計算（行=alive_players順, 列=PRESSURE_DIMENSIONS_V7順）
         
-        # --- UPPER層: 意味・文脈・理念（R=small） ---
-        player.pressure_system.register_dimension(
-            name='strategic_narrative',
-            calculator=self.strategic_narrative_calculator(player),
-            layer=SSDLayer.UPPER,
-            weight=0.6,
-            description='戦略的物語圧力（上層）'
-        )
-        player.pressure_system.register_dimension(
-            name='ideological_pressure',
-            calculator=self.ideological_pressure_calculator(player),
-            layer=SSDLayer.UPPER,
-            weight=0.4,
-            description='理念圧力（上層）'
-        )
+        各次元は本人の状態と日中不変の集計値のみに依存し、本人の状態は
+        自分のターンの圧力計算後にしか変化しないため、日の始めにまとめて計算できる。
+        """
+        n = len(alive_players)
+        rows = np.fromiter((self.name_to_idx[p.name] for p in alive_players), np.intp, n)
+        T = self.trust_mat[rows]
+        feats = np.empty((n, 8))
+        # 自分を疑っている生存者数 / 信頼できる生存者数
+        feats[:, FEAT_ACCUSERS] = ((T < 0.3) & self.alive_mask[None, :] & self._not_self[rows]).sum(axis=1)
+        feats[:, FEAT_ALLIES] = ((T > 0.7) & self.alive_mask[None, :]).sum(axis=1)
+        for k, player in enumerate(alive_players):
+            feats[k, FEAT_STATEMENTS] = player.statement_count
+            feats[k, FEAT_SUSPICION] = player.suspicion_level
+            feats[k, FEAT_ROLE] = player.role_id
+            feats[k, FEAT_PERSONA] = player.persona_id
+        feats[:, FEAT_WEREWOLVES_ALIVE] = werewolves_alive
+        feats[:, FEAT_DAY] = self.day
+        
+        values = np.empty((len(alive_players), len(PRESSURE_DIMENSIONS_V7)))
+        compute_pressure_values(feats, values)
+        return values
     
     def assign_persona(self, role: str) -> Persona:
         """役割ベースのペルソナ割り当て"""
         if role == "WEREWOLF":
-            return random.choice([Persona.STEALTH, Persona.STEALTH, Persona.AGGRESSIVE])
+            return random.choice(_WEREWOLF_PERSONAS)
         elif role == "SEER":
             return Persona.LEADER
         else:
-            return random.choice([Persona.STEALTH, Persona.AGGRESSIVE, 
-                                Persona.LEADER, Persona.DISRUPTOR])
+            return random.choice(_VILLAGER_PERSONAS)
     
     def setup_game(self):
         """ゲーム初期化（v7版）"""
@@ -402,10 +506,11 @@ class WerewolfGameV7:
         roles = ["WEREWOLF", "WEREWOLF", "VILLAGER", "SEER", 
                  "VILLAGER", "VILLAGER", "VILLAGER"]
         
-        print("=" * 70)
-        print("SSD v7.0 四層構造統合版: 人狼ゲームAI")
-        print("=" * 70)
-        print("\n[初期配置]")
+        if self.verbosity:
+            print("=" * 70)
+            print("SSD v7.0 四層構造統合版: 人狼ゲームAI")
+            print("=" * 70)
+            print("\n[初期配置]")
         
         for name, role in zip(names, roles):
             persona = self.assign_persona(role)
@@ -442,35 +547,37 @@ class WerewolfGameV7:
             # [v7] 四層構造圧力次元を登録
             self.create_werewolf_pressure_v7(player)
             
-            print(f"  {name}: {role} / {persona.value} "
-                  f"(E_d={state.E_direct:.0f}, E_i={state.E_indirect:.0f}, "
-                  f"κ={state.kappa:.1f})")
-        
-        for p in self.players:
-            p.trust_map = {other.name: 0.5 for other in self.players if other.name != p.name}
+            if self.verbosity:
+                print(f"  {name}: {role} / {persona.value} "
+                      f"(E_d={state.E_direct:.0f}, E_i={state.E_indirect:.0f}, "
+                      f"κ={state.kappa:.1f})")
+        
+        # 信頼行列を初期化（全員0.5から開始）
+        n = len(self.players)
+        self.name_to_idx = {p.name: i for i, p in enumerate(self.players)}
+        self.trust_mat = np.full((n, n), 0.5)
+        self.alive_mask = np.ones(n, dtype=bool)
+        self._not_self = ~np.eye(n, dtype=bool)
+        self._p_totals = np.zeros(n)
     
-    def query_strategy_db(self, player: WerewolfPlayerV7) -> Optional[StrategyQuery]:
-        """戦略DB参照（第一階層: 中核構造）"""
+    def query_strategy_db(self, player: WerewolfPlayerV7, context: dict) -> Optional[StrategyQuery]:
+        """戦略DB参照（第一階層: 中核構造）
+        
+        contextはrun_day_phaseがターン毎に構築したもの（day, is_werewolf, seer_revealed,
+        suspicion_level, werewolves_alive, villagers_alive）
+        """
         if player.state.E_indirect < 15.0:
             return None
         
-        context = {
-            'day': self.day,
-            'role': player.role,
-            'seer_revealed': self.seer_revealed,
-            'suspicion_level': player.suspicion_level,
-            'werewolves_alive': sum(1 for p in self.players if p.alive and p.role == "WEREWOLF"),
-            'villagers_alive': sum(1 for p in self.players if p.alive and p.role != "WEREWOLF"),
-        }
-        
-        applicable_strategies = [
-            s for s in STRATEGY_DB if s.condition(context)
-        ]
+        applicable = evaluate_strategies(
+            context['day'], context['is_werewolf'], context['seer_revealed'],
+            context['suspicion_level'], context['werewolves_alive'], context['villagers_alive']
+        )
         
-        if not applicable_strategies:
+        if not applicable.any():
             return None
         
-        best_strategy = max(applicable_strategies, key=lambda s: s.priority)
+        best_strategy = STRATEGY_DB[int(np.argmax(np.where(applicable, _STRATEGY_PRIORITY, -np.inf)))]
         
         # E_indirectを消費
         player.state.E_indirect -= best_strategy.energy_cost
@@ -485,19 +592,13 @@ class WerewolfGameV7:
         )
     
     def thinking_phase(self, player: WerewolfPlayerV7, 
-                       alive_players: List[WerewolfPlayerV7]) -> Optional[ThoughtSimulation]:
+                       alive_players: List[WerewolfPlayerV7],
+                       draws: List[float]) -> Optional[ThoughtSimulation]:
         """思考フェーズ（第二階層: 内的シミュレーション）"""
         if player.state.E_indirect < 20.0:
             return None
         
-        think_probability = {
-            Persona.STEALTH: 0.3,
-            Persona.AGGRESSIVE: 0.5,
-            Persona.LEADER: 0.8,
-            Persona.DISRUPTOR: 0.4
-        }.get(player.persona, 0.5)
-        
-        if random.random() > think_probability:
+        if draws[DRAW_THINK] > _THINK_PROB[player.persona_id]:
             return None
         
         # ターゲット選定
@@ -505,11 +606,11 @@ class WerewolfGameV7:
         if not targets:
             return None
         
-        target = random.choice(targets)
+        target = targets[int(draws[DRAW_TARGET] * len(targets))]
         
         # 予測シミュレーション
-        predicted_suspicion_change = random.uniform(-2.0, 3.0)
-        predicted_trust_impact = random.uniform(-1.0, 2.0)
+        predicted_suspicion_change = -2.0 + 5.0 * draws[DRAW_PRED_SUSPICION]
+        predicted_trust_impact = -1.0 + 3.0 * draws[DRAW_PRED_TRUST]
         
         # E_indirectを消費
         player.state.E_indirect -= 20.0
@@ -588,7 +689,8 @@ class WerewolfGameV7:
         )
     
     def attempt_rulebreak(self, player: WerewolfPlayerV7, 
-                         pressures: Dict[SSDLayer, float]) -> Optional[RuleBreakAction]:
+                         pressures: np.ndarray,
+                         draws: List[float]) -> Optional[RuleBreakAction]:
         """
         ルールブレイク試行（v7版: 四層構造圧力を受け取る）
         
@@ -596,32 +698,33 @@ class WerewolfGameV7:
         v6: total_pressure（単一値）で判定
         v7: 層別圧力を使用し、BASE層が高い場合に本能的ルールブレイク
         """
-        if player.persona != Persona.DISRUPTOR:
+        candidates = RULEBREAK_BY_PERSONA[player.persona]
+        if not candidates:
             return None
         
         # [v7] BASE層圧力が高い場合、本能的ルールブレイク
-        base_pressure = pressures.get(SSDLayer.BASE, 0.0)
-        total_pressure = sum(pressures.values())
+        base_pressure = pressures[LAYER_BASE]
+        total_pressure = pressures.sum()
         
         # BASE層が支配的な場合、閾値を下げる
         threshold_modifier = 0.7 if base_pressure > 0.6 else 1.0
         
-        applicable = [
-            rb for rb in RULEBREAK_ACTIONS 
-            if total_pressure * 100 > rb.trigger_threshold * threshold_modifier
-        ]
+        n_applicable = int(np.count_nonzero(
+            total_pressure * 100 > _RULEBREAK_THRESHOLDS[player.persona] * threshold_modifier))
         
-        if not applicable:
+        if not n_applicable:
             return None
         
-        selected = random.choice(applicable)
+        # 適用可能な候補（末尾n_applicable件）から一様に選択
+        selected = candidates[len(candidates) - n_applicable + int(draws[DRAW_RULEBREAK] * n_applicable)]
         player.rulebreaks_performed += 1
         self.total_rulebreaks += 1
         
         return selected
     
     def attempt_persona_transition(self, player: WerewolfPlayerV7,
-                                    pressures: Dict[SSDLayer, float]) -> bool:
+                                    pressures: np.ndarray,
+                                    draws: List[float]) -> bool:
         """
         ペルソナ変異試行（v7版: 四層構造圧力を使用）
         
@@ -629,8 +732,8 @@ class WerewolfGameV7:
         v6: total_pressure（単一値）で判定
         v7: UPPER層圧力が高い場合に理念的変異、BASE層圧力が高い場合に本能的変異
         """
-        upper_pressure = pressures.get(SSDLayer.UPPER, 0.0)
-        base_pressure = pressures.get(SSDLayer.BASE, 0.0)
+        upper_pressure = pressures[LAYER_UPPER]
+        base_pressure = pressures[LAYER_BASE]
         
         # UPPER層が高い場合、理念的変異（LEADER, AGGRESSIVE方向）
         # BASE層が高い場合、本能的変異（STEALTH, DISRUPTOR方向）
@@ -643,70 +746,76 @@ class WerewolfGameV7:
         else:
             transition_prob = base_prob
         
-        if random.random() > transition_prob:
-            return False
-        
-        applicable = [
-            t for t in PERSONA_TRANSITIONS 
-            if t.from_persona == player.persona
-        ]
-        
-        if not applicable:
+        if draws[DRAW_TRANSITION] > transition_prob:
             return False
         
-        # BASE層優勢 → STEALTH/DISRUPTORへの変異を優先
-        # UPPER層優勢 → LEADER/AGGRESSIVEへの変異を優先
-        if base_pressure > upper_pressure:
-            # 本能的変異
-            preferred = [t for t in applicable 
-                        if t.to_persona in [Persona.STEALTH, Persona.DISRUPTOR]]
-            selected = random.choice(preferred if preferred else applicable)
-        else:
-            # 理念的変異
-            preferred = [t for t in applicable 
-                        if t.to_persona in [Persona.LEADER, Persona.AGGRESSIVE]]
-            selected = random.choice(preferred if preferred else applicable)
-        
-        if random.random() < selected.probability:
-            old_persona = player.persona
-            player.persona = selected.to_persona
-            player.persona_transitions += 1
-            self.log_event(f"    💥 {player.name}が{selected.trigger_message}! "
-                          f"{old_persona.value}→{player.persona.value}")
-            return True
+        # BASE層優勢 → STEALTH/DISRUPTORへの変異を優先（本能的変異）
+        # UPPER層優勢 → LEADER/AGGRESSIVEへの変異を優先（理念的変異）
+        # 候補選択と変異成功判定を1回の抽選で行う（どのしきい値にも届かなければ変異なし）
+        u = draws[DRAW_TRANSITION_PICK]
+        for threshold, selected in _TRANSITION_CANDIDATES[player.persona, base_pressure > upper_pressure]:
+            if u < threshold:
+                old_persona = player.persona
+                self.set_persona(player, selected.to_persona)
+                player.persona_transitions += 1
+                self.log_event("    💥 %sが%s! %s→%s", player.name, selected.trigger_message,
+                               old_persona.value, player.persona.value)
+                return True
         
         return False
     
     def run_day_phase(self):
         """1日フェーズの実行（v7版）"""
         self.day += 1
-        print(f"\n{'='*70}")
-        print(f"Day {self.day}")
-        print(f"{'='*70}")
-        
+        verbose = self.verbosity
+        write = self._logbuf.append  # 出力は1日分まとめて書き出す
+        if verbose:
+            write(f"\n{'='*70}\n")
+            write(f"Day {self.day}\n")
+            write(f"{'='*70}\n")
+        
+        # 生存者・生存マスクと陣営別人数は1日1回集計（日中に死亡処理はない）
         alive_players = [p for p in self.players if p.alive]
-        
-        for player in alive_players:
-            print(f"\n[{player.name}のターン] ({player.role} / {player.persona.value})")
+        self.alive_mask = np.fromiter((p.alive for p in self.players), np.bool_, len(self.players))
+        werewolves_alive = sum(1 for p in alive_players if p.role_id == Role.WEREWOLF)
+        context = {
+            'day': self.day,
+            'seer_revealed': self.seer_revealed,
+            'werewolves_alive': werewolves_alive,
+            'villagers_alive': len(alive_players) - werewolves_alive,
+        }
+        # [v7核心機能] 四層構造圧力の次元値を全員分まとめて計算
+        pressure_values = self.compute_day_pressure_values(alive_players, werewolves_alive)
+        # ターン内で使う乱数を全員分まとめて生成
+        day_draws = np.random.random((len(alive_players), _N_DRAWS)).tolist()
+        p_totals = self._p_totals[:len(alive_players)]  # 日の終わりに一括でエンジンへ渡す
+        
+        for k, player in enumerate(alive_players):
+            if verbose:
+                write(f"\n[{player.name}のターン] ({player.role} / {player.persona.value})\n")
+            context['is_werewolf'] = player.role_id == Role.WEREWOLF
+            context['suspicion_level'] = player.suspicion_level
+            draws = day_draws[k]
             
             # [v7核心機能] 四層構造圧力計算
-            context = {}
-            pressures = player.pressure_system.calculate(context)
-            
-            # 層別圧力表示
-            print(f"  層別圧力:")
-            for layer, pressure in pressures.items():
-                print(f"    {layer.name:10s}: {pressure:.3f}")
+            pressures = player.pressure_system.calculate_from_values(pressure_values[k], as_array=True)
             
             # [v7新機能] 支配的な層を判定
             dominant_layer, dominant_pressure = player.pressure_system.get_dominant_layer()
-            print(f"  支配的層: {dominant_layer.name} ({dominant_pressure:.3f})")
+            
+            # 層別圧力表示
+            if verbose:
+                write(f"  層別圧力:\n")
+                for layer_name, pressure in zip(_LAYER_NAMES, pressures.tolist()):
+                    write(f"    {layer_name:10s}: {pressure:.3f}\n")
+                write(f"  支配的層: {dominant_layer.name} ({dominant_pressure:.3f})\n")
             
             # [v7新機能] 層間葛藤を計算
-            conflicts = player.pressure_system.get_layer_conflict_index()
-            max_conflict = max(conflicts.items(), key=lambda x: x[1]) if conflicts else (None, 0.0)
-            if max_conflict[0] and max_conflict[1] > 0.3:
-                print(f"  ⚠️ 層間葛藤: {max_conflict[0]} = {max_conflict[1]:.3f}")
+            conflict_idx, conflict_value = max_layer_conflict(pressures)
+            if conflict_value > 0.3:
+                max_conflict = (LAYER_CONFLICT_LABELS[conflict_idx], float(conflict_value))
+                if verbose:
+                    write(f"  ⚠️ 層間葛藤: {max_conflict[0]} = {max_conflict[1]:.3f}\n")
                 self.total_layer_conflicts += 1
                 
                 # 葛藤イベント記録
@@ -722,68 +831,83 @@ class WerewolfGameV7:
             # [v7新機能] 跳躍判定（R値ベース）
             leap_layer = player.pressure_system.should_trigger_leap(threshold=0.6)
             if leap_layer:
-                print(f"  🔥 跳躍トリガー: {leap_layer.name}層")
+                if verbose:
+                    write(f"  🔥 跳躍トリガー: {leap_layer.name}層\n")
                 if leap_layer == SSDLayer.BASE:
-                    print(f"      → 本能的行動（生存優先）")
+                    if verbose:
+                        write(f"      → 本能的行動（生存優先）\n")
                     player.base_leaps += 1
                 elif leap_layer == SSDLayer.UPPER:
-                    print(f"      → 理念的行動（戦略優先）")
+                    if verbose:
+                        write(f"      → 理念的行動（戦略優先）\n")
                     player.upper_leaps += 1
                 elif leap_layer == SSDLayer.PHYSICAL:
-                    print(f"      → 物理的制約（強制的行動変更）")
+                    if verbose:
+                        write(f"      → 物理的制約（強制的行動変更）\n")
                     player.physical_constraints += 1
             
             # 既存のロジック継続（戦略DB、思考フェーズ、認知的不協和）
-            strategy = self.query_strategy_db(player)
+            strategy = self.query_strategy_db(player, context)
             if strategy and strategy.strategy:
-                print(f"  📖 戦略DB参照: {strategy.strategy.name} (信頼度={strategy.confidence:.2f})")
+                if verbose:
+                    write(f"  📖 戦略DB参照: {strategy.strategy.name} (信頼度={strategy.confidence:.2f})\n")
                 self.total_strategies_invoked += 1
             
-            thought = self.thinking_phase(player, alive_players)
-            if thought:
-                print(f"  💭 内的シミュレーション: {thought.target} "
+            thought = self.thinking_phase(player, alive_players, draws)
+            if thought and verbose:
+                write(f"  💭 内的シミュレーション: {thought.target} "
                       f"(疑惑Δ={thought.predicted_suspicion_change:+.1f}, "
-                      f"信頼Δ={thought.predicted_trust_impact:+.1f})")
+                      f"信頼Δ={thought.predicted_trust_impact:+.1f})\n")
             
             # 認知的不協和解決
             conflict_result = self.resolve_cognitive_conflict(player, strategy, thought)
             if conflict_result.conflict_detected:
-                print(f"  ⚖️ 認知的不協和検出")
-                print(f"      戦略提案: {conflict_result.strategy_suggestion}")
-                print(f"      思考提案: {conflict_result.thought_suggestion}")
-                print(f"      解決: {conflict_result.resolution}")
-                print(f"      最終決定: {conflict_result.final_decision}")
+                if verbose:
+                    write(f"  ⚖️ 認知的不協和検出\n")
+                    write(f"      戦略提案: {conflict_result.strategy_suggestion}\n")
+                    write(f"      思考提案: {conflict_result.thought_suggestion}\n")
+                    write(f"      解決: {conflict_result.resolution}\n")
+                    write(f"      最終決定: {conflict_result.final_decision}\n")
                 player.cognitive_conflicts += 1
                 self.total_cognitive_conflicts += 1
             
             # [v7改良] ルールブレイク（四層構造圧力を使用）
-            rulebreak = self.attempt_rulebreak(player, pressures)
-            if rulebreak:
-                print(f"  🚨 ルールブレイク: {rulebreak.break_type.value}")
+            rulebreak = self.attempt_rulebreak(player, pressures, draws)
+            if rulebreak and verbose:
+                write(f"  🚨 ルールブレイク: {rulebreak.break_type.value}\n")
             
             # [v7改良] ペルソナ変異（四層構造圧力を使用）
-            self.attempt_persona_transition(player, pressures)
-            
-            # SSDエンジン更新
-            total_pressure_value = sum(pressures.values())
-            p_external = np.array([total_pressure_value, 0.0, 0.0])
+            self.attempt_persona_transition(player, pressures, draws)
             
-            new_state = player.engine.step(player.state, p_external, dt=1.0)
-            
-            if new_state.is_critical:
-                self.phase_transitions += 1
-                print(f"  ⚡ 相転移発生! E_i({player.state.E_indirect:.1f}) < Θ({player.engine.params.Theta_critical:.1f})")
-                print(f"      → γ_i2d強化: 言葉→暴力への跳躍")
-            
-            player.state = new_state
+            p_totals[k] = pressures.sum()
             player.statement_count += 1
             
             # 疑惑レベル更新
-            player.suspicion_level += random.uniform(-0.5, 1.0)
+            player.suspicion_level += -0.5 + 1.5 * draws[DRAW_SUSPICION]
             player.suspicion_level = max(0.0, player.suspicion_level)
-            
-            print(f"  最終状態: E_d={player.state.E_direct:.1f}, "
-                  f"E_i={player.state.E_indirect:.1f}, κ={player.state.kappa:.2f}")
+        
+        # SSDエンジン更新（エンジン状態は本人のターンでしか参照しないため日の終わりに一括実行）
+        is_critical = self.step_engines(alive_players, p_totals)
+        
+        self.phase_transitions += int(is_critical.sum())
+        if not verbose:
+            return
+        
+        write(f"\n[Day {self.day} 終了時の状態]\n")
+        for k, player in enumerate(alive_players):
+            write(f"  {player.name}: E_d={player.state.E_direct:.1f}, "
+                  f"E_i={player.state.E_indirect:.1f}, κ={player.state.kappa:.2f}\n")
+            if is_critical[k]:
+                write(f"    ⚡ 相転移発生! E_i({player.state.E_indirect:.1f}) < Θ({player.engine.params.Theta_critical:.1f})\n")
+                write(f"        → γ_i2d強化: 言葉→暴力への跳躍\n")
+        
+        sys.stdout.write(''.join(self._logbuf))
+        self._logbuf.clear()
+    
+    def step_engines(self, players: List[WerewolfPlayerV7], p_totals: np.ndarray,
+                     dt: float = 1.0) -> np.ndarray:
+        """v7: 各プレイヤーのSSDCoreEngineV3_5.stepをstep_batchedでまとめて実行（戻り値: 臨界マスク）"""
+        return step_batched([p.engine for p in players], [p.state for p in players], p_totals, dt)
     
     def print_final_statistics(self):
         """最終統計（v7版: 四層構造統計を含む）"""
@@ -31,9 +31,11 @@ v8の革新:
 """
 
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import List, Dict, Tuple, Optional, Callable
+from operator import attrgetter
 import random
+import sys
 import numpy as np
 
 # ========== [v8核心] SSD v4.0コアエンジン（層別E・κ）インポート ==========
@@ -41,14 +43,19 @@ from ssd_core_engine_v4 import (
     SSDCoreEngineV4,
     SSDStateV4,
     SSDParametersV4,
-    SSDLayer
+    step_batched
 )
 
 # ========== [v8継続] 四層構造多次元意味圧システム ==========
+# 層別圧力の辞書キーとなるため、層はこちらのSSDLayerで指定する
 from ssd_multidimensional_pressure_v2 import (
-    MultiDimensionalPressure
+    MultiDimensionalPressure,
+    SSDLayer
 )
 
+# 層メンバーのモジュール定数（ターン毎のEnum属性解決を避ける）
+_BASE, _CORE, _UPPER, _PHYSICAL = SSDLayer.BASE, SSDLayer.CORE, SSDLayer.UPPER, SSDLayer.PHYSICAL
+
 # ========== v7継承: ペルソナシステム ==========
 class Persona(Enum):
     STEALTH = "潜伏型"
@@ -56,6 +63,15 @@ class Persona(Enum):
     LEADER = "リーダー型"
     DISRUPTOR = "攪乱型"
 
+class Role(IntEnum):
+    """役職コード"""
+    WEREWOLF = 0
+    SEER = 1
+    VILLAGER = 2
+
+# Persona → 整数コード（Personaの定義順）
+_PERSONA_CODE = {persona: i for i, persona in enumerate(Persona)}
+
 @dataclass
 class PersonaTransition:
     from_persona: Persona
@@ -74,44 +90,64 @@ PERSONA_TRANSITIONS = [
 ]
 
 # ========== v7継承: 戦略データベース ==========
+# エネルギー消費層 → 消費するSSDStateV4の属性
+_ENERGY_COST_ATTR = {'BASE': 'E_base', 'CORE': 'E_core', 'UPPER': 'E_upper'}
+
 @dataclass
 class GameStrategy:
     name: str
-    condition: callable
     action_type: str
     priority: float
     description: str
     energy_cost_layer: str = "CORE"  # [v8] エネルギー消費層を指定
+    # 発動条件: role/day は STRATEGY_BY_ROLE の索引で事前に絞り込み、残りを condition で判定
+    role: Optional[str] = None            # 対象役職（None=全役職）
+    day: Optional[int] = None             # 発動日（None=毎日）
+    condition: Optional[Callable[[dict], bool]] = None
+    energy_cost_attr: str = field(init=False)  # energy_cost_layerから決まる消費先の状態属性
+    
+    def __post_init__(self):
+        self.energy_cost_attr = _ENERGY_COST_ATTR[self.energy_cost_layer]
 
 STRATEGY_DB: List[GameStrategy] = [
     GameStrategy(
         name="EARLY_SILENCE",
-        condition=lambda ctx: ctx.get('day') == 1 and ctx.get('role') == 'WEREWOLF',
         action_type="MINIMIZE_STATEMENTS",
         priority=7.0,
         description="序盤は情報を与えるな",
-        energy_cost_layer="CORE"
+        energy_cost_layer="CORE",
+        role="WEREWOLF",
+        day=1
     ),
     GameStrategy(
         name="TRUST_BUILDING",
-        condition=lambda ctx: ctx.get('suspicion_level', 0) > 5.0,
         action_type="COOPERATIVE_VOTE",
         priority=6.0,
         description="疑われたら協調行動で信頼回復",
-        energy_cost_layer="CORE"
+        energy_cost_layer="CORE",
+        condition=lambda ctx: ctx.get('suspicion_level', 0) > 5.0
     ),
     GameStrategy(
         name="DIVIDE_CONQUER",
-        condition=lambda ctx: ctx.get('role') == 'WEREWOLF' and ctx.get('villagers_alive') > 3,
         action_type="TARGET_ALLIANCE",
         priority=5.0,
         description="村人同盟を分断せよ",
-        energy_cost_layer="UPPER"
+        energy_cost_layer="UPPER",
+        role="WEREWOLF",
+        condition=lambda ctx: ctx.get('villagers_alive') > 3
     ),
 ]
 
+# 役職別の候補戦略（優先度の降順, 同順位はSTRATEGY_DB順）: 先頭から判定し最初の適用戦略を採用
+_STRATEGIES_BY_PRIORITY = sorted(STRATEGY_DB, key=lambda s: -s.priority)
+STRATEGY_BY_ROLE: Dict[Optional[str], List[GameStrategy]] = {
+    role: [s for s in _STRATEGIES_BY_PRIORITY if s.role is None or s.role == role]
+    for role in (None, "WEREWOLF", "SEER", "VILLAGER")
+}
+
 # ========== [v8新機能] 構造的影響力モデル ==========
-@dataclass
+# dataclassのslots指定はPython 3.10以降のみ対応（それ以前は通常の__dict__で動作）
+@dataclass(frozen=True, **({'slots': True} if sys.version_info >= (3, 10) else {}))
 class StructuralPower:
     """構造的影響力 = Pressure × E × kappa × R"""
     layer_name: str
@@ -127,150 +163,145 @@ class StructuralPower:
                 f"κ={self.kappa:.2f} × R={self.R_value:.1f} "
                 f"= {self.total_power:.1f}")
 
+# 構造的影響力を計算する層（並び順）とR値（動かしにくさ）
+_POWER_LAYERS = ('BASE', 'CORE', 'UPPER')
+_POWER_R = np.array([100.0, 10.0, 1.0])
+# SSDStateV4の層別 E・κ を1回の呼び出しで読み出す（並び = E層別3つ, κ層別3つ）
+_get_layer_state = attrgetter('E_base', 'E_core', 'E_upper',
+                              'kappa_base', 'kappa_core', 'kappa_upper')
+
+# ========== [v8核心機能] 四層構造圧力次元（列順=compute_day_pressure_values の出力順） ==========
+# (次元名, 作用層, 重み, 説明)
+PRESSURE_DIMENSIONS_V8 = (
+    # BASE層
+    ('survival_instinct', SSDLayer.BASE, 0.6, '生存本能（疑惑恐怖）'),
+    ('risk_avoidance', SSDLayer.BASE, 0.4, 'リスク回避本能'),
+    # CORE層
+    ('role_performance', SSDLayer.CORE, 0.5, '役割遂行圧力'),
+    ('trust_system', SSDLayer.CORE, 0.5, '信頼システム圧力'),
+    # UPPER層
+    ('strategic_narrative', SSDLayer.UPPER, 0.6, '戦略的物語圧力'),
+    ('ideological_pressure', SSDLayer.UPPER, 0.4, '理念圧力'),
+)
+
+# 理念圧力（persona_idで引く: STEALTH, AGGRESSIVE, LEADER, DISRUPTOR）
+_IDEOLOGICAL_PRESSURE = np.array([0.4, 0.4, 0.7, 0.2])
+
 # ========== プレイヤークラス（v8完全版） ==========
 @dataclass
 class WerewolfPlayerV8:
     name: str
-    role: str
+    role: str  # ログ表示用（判定はrole_idで行う）
     engine: SSDCoreEngineV4
     state: SSDStateV4
     pressure_system: MultiDimensionalPressure
     persona: Persona
     alive: bool = True
     suspicion_level: float = 0.0
-    trust_map: Dict[str, float] = field(default_factory=dict)
     statement_count: int = 0
     
-    # [v8新機能] 層別跳躍統計
-    base_instinct_leaps: int = 0      # BASE層由来の本能的跳躍
-    core_normative_leaps: int = 0     # CORE層由来の規範的跳躍
-    upper_ideological_leaps: int = 0  # UPPER層由来の理念的跳躍
-    
     # v7継承統計
     strategies_used: List[str] = field(default_factory=list)
     persona_transitions: int = 0
     cognitive_conflicts: int = 0
+    
+    # 役職・ペルソナの整数コード
+    role_id: int = field(init=False)
+    persona_id: int = field(init=False)
+    
+    def __post_init__(self):
+        self.role_id = Role[self.role]
+        self.persona_id = _PERSONA_CODE[self.persona]
 
 # ========== ゲームマスター（v8完全版） ==========
 class WerewolfGameV8:
-    def __init__(self):
+    def __init__(self, verbosity: int = 1):
+        self.verbosity = verbosity  # 0: 途中経過を出力しない（最終統計のみ）
         self.players: List[WerewolfPlayerV8] = []
         self.day = 0
         self.events = []
         self.seer_revealed = False
         
-        # [v8新機能] 層別跳躍統計
-        self.total_base_leaps = 0
-        self.total_core_leaps = 0
-        self.total_upper_leaps = 0
+        # [v8新機能] 層別跳躍統計（列: BASE=本能的, CORE=規範的, UPPER=理念的）
+        self.leap_counts = np.zeros((0, 3), dtype=np.int32)  # 行=プレイヤー（name_to_idx順）
+        self.total_leaps = np.zeros(3, dtype=np.int32)
+        
+        # step_batchedへ渡す層別圧力ベクトル（[プレイヤー, BASE/CORE/UPPER, 成分], 第1成分のみ使用）
+        self._pbuf = np.zeros((0, 3, 3), dtype=np.float64)
+        
+        # 生存者数・生存マスクのキャッシュ（run_day_phase冒頭でupdate_alive_countsにより更新）
+        self._wolves_alive = 0
+        self._villagers_alive = 0
+        self.alive_mask = np.zeros(0, dtype=bool)
+        
+        # 信頼関係（行=評価者, 列=評価対象）
+        self.name_to_idx: Dict[str, int] = {}
+        self.trust_mat = np.zeros((0, 0))
+        self._not_self = np.zeros((0, 0), dtype=bool)
         
     def log_event(self, message: str):
         self.events.append(f"  {message}")
-        print(f"  {message}")
-    
-    # ========== [v8核心機能] 四層構造圧力計算関数群 ==========
-    
-    def survival_instinct_calculator(self, player: WerewolfPlayerV8) -> Callable:
-        """BASE層: 生存本能（疑惑恐怖）"""
-        def calc(context: dict) -> float:
-            # 疑惑レベルが高いほど生存本能が高まる
-            return min(1.0, player.suspicion_level / 10.0)
-        return calc
-    
-    def risk_avoidance_calculator(self, player: WerewolfPlayerV8) -> Callable:
-        """BASE層: リスク回避本能"""
-        def calc(context: dict) -> float:
-            accusers = sum(1 for p in self.players 
-                          if p.alive and p.name != player.name 
-                          and player.trust_map.get(p.name, 0.5) < 0.3)
-            return min(1.0, accusers / 4.0)
-        return calc
-    
-    def role_performance_calculator(self, player: WerewolfPlayerV8) -> Callable:
-        """CORE層: 役割遂行圧力"""
-        def calc(context: dict) -> float:
-            if player.role == "WEREWOLF":
-                werewolves = sum(1 for p in self.players if p.alive and p.role == "WEREWOLF")
-                return max(0.0, 1.0 - werewolves / 2.0)
-            else:
-                return min(1.0, player.suspicion_level / 8.0)
-        return calc
+        if self.verbosity:
+            print(f"  {message}")
     
-    def trust_system_calculator(self, player: WerewolfPlayerV8) -> Callable:
-        """CORE層: 信頼システム圧力"""
-        def calc(context: dict) -> float:
-            allies = sum(1 for p in self.players 
-                        if p.alive and player.trust_map.get(p.name, 0.5) > 0.7)
-            return max(0.0, 1.0 - allies / 3.0)
-        return calc
-    
-    def strategic_narrative_calculator(self, player: WerewolfPlayerV8) -> Callable:
-        """UPPER層: 戦略的物語圧力"""
-        def calc(context: dict) -> float:
-            return min(1.0, self.day / 4.0)
-        return calc
-    
-    def ideological_pressure_calculator(self, player: WerewolfPlayerV8) -> Callable:
-        """UPPER層: 理念圧力"""
-        def calc(context: dict) -> float:
-            if player.persona == Persona.LEADER:
-                return 0.7
-            elif player.persona == Persona.DISRUPTOR:
-                return 0.2
-            else:
-                return 0.4
-        return calc
+    # ========== [v8核心機能] 四層構造圧力計算 ==========
     
     def create_werewolf_pressure_v8(self, player: WerewolfPlayerV8) -> None:
-        """[v8] 四層構造多次元意味圧の登録"""
+        """[v8] 四層構造多次元意味圧の登録
         
-        # BASE層
-        player.pressure_system.register_dimension(
-            name='survival_instinct',
-            calculator=self.survival_instinct_calculator(player),
-            layer=SSDLayer.BASE,
-            weight=0.6,
-            description='生存本能（疑惑恐怖）'
-        )
-        player.pressure_system.register_dimension(
-            name='risk_avoidance',
-            calculator=self.risk_avoidance_calculator(player),
-            layer=SSDLayer.BASE,
-            weight=0.4,
-            description='リスク回避本能'
-        )
+        次元値はcompute_day_pressure_valuesで全員分を一括計算するため、
+        ここでは層と重みのメタデータのみ登録する。
+        """
+        for name, layer, weight, description in PRESSURE_DIMENSIONS_V8:
+            player.pressure_system.register_dimension(
+                name=name,
+                calculator=None,
+                layer=layer,
+                weight=weight,
+                description=description
+            )
+    
+    def update_alive_counts(self) -> None:
+        """生存マスク・生存人狼数・生存村人数を再集計してキャッシュ"""
+        self.alive_mask = np.fromiter((p.alive for p in self.players), np.bool_, len(self.players))
+        wolves = villagers = 0
+        for p in self.players:
+            if p.alive:
+                if p.role_id == Role.WEREWOLF:
+                    wolves += 1
+                else:
+                    villagers += 1
+        self._wolves_alive = wolves
+        self._villagers_alive = villagers
+    
+    def compute_day_pressure_values(self, alive_players: List[WerewolfPlayerV8]) -> np.ndarray:
+        """生存者全員の圧力次元値を一括計算（行=alive_players順, 列=PRESSURE_DIMENSIONS_V8順）
         
-        # CORE層
-        player.pressure_system.register_dimension(
-            name='role_performance',
-            calculator=self.role_performance_calculator(player),
-            layer=SSDLayer.CORE,
-            weight=0.5,
-            description='役割遂行圧力'
-        )
-        player.pressure_system.register_dimension(
-            name='trust_system',
-            calculator=self.trust_system_calculator(player),
-            layer=SSDLayer.CORE,
-            weight=0.5,
-            description='信頼システム圧力'
-        )
+        各次元は本人の状態と日中不変の集計値のみに依存し、本人の状態は
+        自分のターンの圧力計算後にしか変化しないため、日の始めにまとめて計算できる。
+        """
+        n = len(alive_players)
+        suspicion = np.fromiter((p.suspicion_level for p in alive_players), float, n)
+        is_wolf = np.fromiter((p.role_id for p in alive_players), np.int8, n) == Role.WEREWOLF
+        persona_ids = np.fromiter((p.persona_id for p in alive_players), np.intp, n)
+        werewolves = self._wolves_alive
+        # 自分を疑っている生存者数 / 信頼できる生存者数
+        rows = np.fromiter((self.name_to_idx[p.name] for p in alive_players), np.intp, n)
+        T = self.trust_mat[rows]
+        accusers = ((T < 0.3) & self.alive_mask[None, :] & self._not_self[rows]).sum(axis=1)
+        allies = ((T > 0.7) & self.alive_mask[None, :]).sum(axis=1)
         
-        # UPPER層
-        player.pressure_system.register_dimension(
-            name='strategic_narrative',
-            calculator=self.strategic_narrative_calculator(player),
-            layer=SSDLayer.UPPER,
-            weight=0.6,
-            description='戦略的物語圧力'
-        )
-        player.pressure_system.register_dimension(
-            name='ideological_pressure',
-            calculator=self.ideological_pressure_calculator(player),
-            layer=SSDLayer.UPPER,
-            weight=0.4,
-            description='理念圧力'
-        )
+        values = np.empty((n, len(PRESSURE_DIMENSIONS_V8)))
+        # BASE: 疑惑レベルが高いほど生存本能が高まる / 告発者が多いほどリスク圧増加
+        values[:, 0] = np.minimum(1.0, suspicion / 10.0)
+        values[:, 1] = np.minimum(1.0, accusers / 4.0)
+        # CORE: 役割遂行（人狼=生存人狼数, それ以外=疑惑度）/ 信頼システム
+        values[:, 2] = np.where(is_wolf, max(0.0, 1.0 - werewolves / 2.0), np.minimum(1.0, suspicion / 8.0))
+        values[:, 3] = np.maximum(0.0, 1.0 - allies / 3.0)
+        # UPPER: 戦略的物語（日数）/ 理念（ペルソナ）
+        values[:, 4] = min(1.0, self.day / 4.0)
+        values[:, 5] = _IDEOLOGICAL_PRESSURE[persona_ids]
+        return values
     
     def assign_persona(self, role: str) -> Persona:
         """役割ベースのペルソナ割り当て"""
@@ -287,16 +318,19 @@ class WerewolfGameV8:
         names = ["太郎", "次郎", "三郎", "四郎", "五郎"]
         roles = ["WEREWOLF", "WEREWOLF", "VILLAGER", "SEER", "VILLAGER"]
         
-        print("=" * 70)
-        print("SSD v8.0 層別E・κ統合版: 人狼ゲームAI")
-        print("=" * 70)
-        print("\n[初期配置]")
+        if self.verbosity:
+            print("=" * 70)
+            print("SSD v8.0 層別E・κ統合版: 人狼ゲームAI")
+            print("=" * 70)
+            print("\n[初期配置]")
+        
+        # [v8] v4.0エンジンのパラメータは全員共通（stepはパラメータを変更しない）
+        params = SSDParametersV4()
         
         for name, role in zip(names, roles):
             persona = self.assign_persona(role)
             
-            # [v8] v4.0エンジン初期化
-            params = SSDParametersV4()
+            # [v8] v4.0エンジン初期化（累積統計はプレイヤーごとに保持）
             engine = SSDCoreEngineV4(params)
             
             # [v8] 層別初期状態
@@ -341,14 +375,20 @@ class WerewolfGameV8:
             
             self.create_werewolf_pressure_v8(player)
             
-            print(f"  {name}: {role} / {persona.value}")
-            print(f"    E: base={state.E_base:.0f}, core={state.E_core:.0f}, "
-                  f"upper={state.E_upper:.0f}, direct={state.E_direct:.0f}")
-            print(f"    κ: base={state.kappa_base:.2f}, core={state.kappa_core:.2f}, "
-                  f"upper={state.kappa_upper:.2f}")
+            if self.verbosity:
+                print(f"  {name}: {role} / {persona.value}")
+                print(f"    E: base={state.E_base:.0f}, core={state.E_core:.0f}, "
+                      f"upper={state.E_upper:.0f}, direct={state.E_direct:.0f}")
+                print(f"    κ: base={state.kappa_base:.2f}, core={state.kappa_core:.2f}, "
+                      f"upper={state.kappa_upper:.2f}")
         
-        for p in self.players:
-            p.trust_map = {other.name: 0.5 for other in self.players if other.name != p.name}
+        n = len(self.players)
+        self.name_to_idx = {p.name: i for i, p in enumerate(self.players)}
+        self.trust_mat = np.full((n, n), 0.5)
+        self._not_self = ~np.eye(n, dtype=bool)
+        self._pbuf = np.zeros((n, 3, 3), dtype=np.float64)
+        self.leap_counts = np.zeros((n, 3), dtype=np.int32)
+        self.update_alive_counts()
     
     def calculate_structural_power(self, player: WerewolfPlayerV8, 
                                     pressures: Dict[SSDLayer, float]) -> Dict[str, StructuralPower]:
@@ -358,82 +398,49 @@ class WerewolfGameV8:
         理論: 構造的影響力 = Pressure × E × kappa × R
         最も影響力が高い層が行動を支配
         """
-        R_values = {
-            'BASE': 100.0,
-            'CORE': 10.0,
-            'UPPER': 1.0
-        }
-        
-        powers = {}
-        
-        # BASE層
-        p_base = pressures.get(SSDLayer.BASE, 0.0)
-        power_base = (p_base * player.state.E_base * 
-                     player.state.kappa_base * R_values['BASE'])
-        powers['BASE'] = StructuralPower(
-            layer_name='BASE',
-            pressure=p_base,
-            energy=player.state.E_base,
-            kappa=player.state.kappa_base,
-            R_value=R_values['BASE'],
-            total_power=power_base
-        )
+        P = np.array([pressures.get(_BASE, 0.0),
+                      pressures.get(_CORE, 0.0),
+                      pressures.get(_UPPER, 0.0)])
+        E, K = np.array(_get_layer_state(player.state)).reshape(2, 3)
         
-        # CORE層
-        p_core = pressures.get(SSDLayer.CORE, 0.0)
-        power_core = (p_core * player.state.E_core * 
-                     player.state.kappa_core * R_values['CORE'])
-        powers['CORE'] = StructuralPower(
-            layer_name='CORE',
-            pressure=p_core,
-            energy=player.state.E_core,
-            kappa=player.state.kappa_core,
-            R_value=R_values['CORE'],
-            total_power=power_core
-        )
+        # 3層分の P × E × κ × R を一括計算
+        totals = P * E * K * _POWER_R
         
-        # UPPER層
-        p_upper = pressures.get(SSDLayer.UPPER, 0.0)
-        power_upper = (p_upper * player.state.E_upper * 
-                      player.state.kappa_upper * R_values['UPPER'])
-        powers['UPPER'] = StructuralPower(
-            layer_name='UPPER',
-            pressure=p_upper,
-            energy=player.state.E_upper,
-            kappa=player.state.kappa_upper,
-            R_value=R_values['UPPER'],
-            total_power=power_upper
-        )
+        powers = {
+            name: StructuralPower(
+                layer_name=name,
+                pressure=p,
+                energy=e,
+                kappa=k,
+                R_value=r,
+                total_power=total
+            )
+            for name, p, e, k, r, total in zip(_POWER_LAYERS, P.tolist(), E.tolist(), K.tolist(),
+                                               _POWER_R.tolist(), totals.tolist())
+        }
         
         return powers
     
-    def query_strategy_db(self, player: WerewolfPlayerV8) -> Optional[GameStrategy]:
-        """戦略DB参照（v8: 層別エネルギー消費）"""
+    def query_strategy_db(self, player: WerewolfPlayerV8, context: dict) -> Optional[GameStrategy]:
+        """戦略DB参照（v8: 層別エネルギー消費）
+        
+        contextはrun_day_phaseが1日1回構築し、ターン毎にrole・suspicion_levelを
+        更新したもの（day, role, suspicion_level, werewolves_alive, villagers_alive）
+        """
         # [v8] CORE層エネルギー不足なら参照不可
         if player.state.E_core < 15.0:
             return None
         
-        context = {
-            'day': self.day,
-            'role': player.role,
-            'suspicion_level': player.suspicion_level,
-            'werewolves_alive': sum(1 for p in self.players if p.alive and p.role == "WEREWOLF"),
-            'villagers_alive': sum(1 for p in self.players if p.alive and p.role != "WEREWOLF"),
-        }
-        
-        applicable = [s for s in STRATEGY_DB if s.condition(context)]
-        if not applicable:
+        candidates = STRATEGY_BY_ROLE.get(player.role, STRATEGY_BY_ROLE[None])
+        best = next((s for s in candidates
+                     if (s.day is None or s.day == self.day)
+                     and (s.condition is None or s.condition(context))), None)
+        if best is None:
             return None
         
-        best = max(applicable, key=lambda s: s.priority)
-        
         # [v8] 指定された層からエネルギー消費
-        if best.energy_cost_layer == "BASE":
-            player.state.E_base = max(0, player.state.E_base - 15.0)
-        elif best.energy_cost_layer == "CORE":
-            player.state.E_core = max(0, player.state.E_core - 15.0)
-        elif best.energy_cost_layer == "UPPER":
-            player.state.E_upper = max(0, player.state.E_upper - 15.0)
+        attr = best.energy_cost_attr
+        setattr(player.state, attr, max(0, getattr(player.state, attr) - 15.0))
         
         player.strategies_used.append(best.name)
         return best
@@ -441,76 +448,106 @@ class WerewolfGameV8:
     def run_day_phase(self):
         """1日フェーズの実行（v8版）"""
         self.day += 1
-        print(f"\n{'='*70}")
-        print(f"Day {self.day}")
-        print(f"{'='*70}")
+        verbose = self.verbosity
+        if verbose:
+            print(f"\n{'='*70}")
+            print(f"Day {self.day}")
+            print(f"{'='*70}")
         
         alive_players = [p for p in self.players if p.alive]
+        self.update_alive_counts()
+        # [v8] 四層構造圧力の次元値を全員分まとめて計算
+        pressure_values = self.compute_day_pressure_values(alive_players)
+        # 疑惑レベルの揺らぎ（1日分を一括生成）
+        suspicion_noise = np.random.uniform(-0.5, 1.0, len(alive_players)).tolist()
+        
+        # 戦略DB参照用の文脈（日中不変の項目のみ。role・suspicion_levelはターン毎に更新）
+        context = {
+            'day': self.day,
+            'role': None,
+            'suspicion_level': 0.0,
+            'werewolves_alive': self._wolves_alive,
+            'villagers_alive': self._villagers_alive,
+        }
         
-        for player in alive_players:
-            print(f"\n[{player.name}のターン] ({player.role} / {player.persona.value})")
+        pbuf = self._pbuf
+        turn_logs = []  # ターンごとのstep前の出力（stepを一括実行した後にターン順で出力）
+        for k, player in enumerate(alive_players):
+            log = []
+            if verbose:
+                log.append(f"\n[{player.name}のターン] ({player.role} / {player.persona.value})")
             
             # [v8] 四層構造圧力計算
-            context = {}
-            pressures = player.pressure_system.calculate(context)
-            
-            print(f"  層別圧力:")
-            for layer, pressure in pressures.items():
-                if layer != SSDLayer.PHYSICAL:
-                    print(f"    {layer.name:10s}: {pressure:.3f}")
+            pressures = player.pressure_system.calculate_from_values(pressure_values[k])
             
-            # [v8核心機能] 構造的影響力計算
-            structural_powers = self.calculate_structural_power(player, pressures)
+            if verbose:
+                log.append(f"  層別圧力:")
+                for layer, pressure in pressures.items():
+                    if layer != _PHYSICAL:
+                        log.append(f"    {layer.name:10s}: {pressure:.3f}")
             
-            print(f"\n  構造的影響力 (P×E×κ×R):")
-            for layer_name, power in structural_powers.items():
-                print(f"    {power}")
-            
-            # 支配的な層を判定
-            dominant = max(structural_powers.items(), key=lambda x: x[1].total_power)
-            print(f"\n  支配的層: {dominant[0]} (影響力={dominant[1].total_power:.1f})")
+            # [v8核心機能] 構造的影響力計算（状態を変更しない表示用の診断のため出力時のみ）
+            if verbose:
+                structural_powers = self.calculate_structural_power(player, pressures)
+                
+                log.append(f"\n  構造的影響力 (P×E×κ×R):")
+                for layer_name, power in structural_powers.items():
+                    log.append(f"    {power}")
+                
+                # 支配的な層を判定
+                dominant = max(structural_powers.items(), key=lambda x: x[1].total_power)
+                log.append(f"\n  支配的層: {dominant[0]} (影響力={dominant[1].total_power:.1f})")
             
             # [v8] 戦略DB参照
-            strategy = self.query_strategy_db(player)
-            if strategy:
-                print(f"  [戦略] {strategy.name}")
-            
-            # [v8核心機能] v4.0エンジン更新（層別圧力を投入）
-            p_base = np.array([pressures.get(SSDLayer.BASE, 0.0), 0.0, 0.0])
-            p_core = np.array([pressures.get(SSDLayer.CORE, 0.0), 0.0, 0.0])
-            p_upper = np.array([pressures.get(SSDLayer.UPPER, 0.0), 0.0, 0.0])
+            context['role'] = player.role
+            context['suspicion_level'] = player.suspicion_level
+            strategy = self.query_strategy_db(player, context)
+            if strategy and verbose:
+                log.append(f"  [戦略] {strategy.name}")
             
-            new_state = player.engine.step(player.state, p_base, p_core, p_upper, dt=1.0)
+            # [v8核心機能] v4.0エンジンへ投入する層別圧力
+            pbuf[k, 0, 0] = pressures.get(_BASE, 0.0)
+            pbuf[k, 1, 0] = pressures.get(_CORE, 0.0)
+            pbuf[k, 2, 0] = pressures.get(_UPPER, 0.0)
+            turn_logs.append(log)
+        
+        # [v8核心機能] v4.0エンジン更新（各プレイヤーのstepは自分の状態のみを更新するため一日分まとめて実行）
+        critical = step_batched([p.engine for p in alive_players],
+                                [p.state for p in alive_players], pbuf, dt=1.0)
+        
+        # [v8] 層別相転移（跳躍）の集計
+        rows = np.fromiter((self.name_to_idx[p.name] for p in alive_players), np.intp, len(alive_players))
+        self.leap_counts[rows] += critical
+        self.total_leaps += critical.sum(axis=0, dtype=np.int32)
+        critical = critical.tolist()
+        
+        for k, player in enumerate(alive_players):
+            if verbose:
+                print("\n".join(turn_logs[k]))
+            is_critical_base, is_critical_core, is_critical_upper = critical[k]
             
             # [v8] 層別相転移検出
-            if new_state.is_critical_base:
-                print(f"  [!] BASE層相転移! 本能的跳躍（パニック、逃走）")
-                player.base_instinct_leaps += 1
-                self.total_base_leaps += 1
-            
-            if new_state.is_critical_core:
-                print(f"  [!] CORE層相転移! 規範的跳躍（ルール破壊）")
-                player.core_normative_leaps += 1
-                self.total_core_leaps += 1
+            if verbose:
+                if is_critical_base:
+                    print(f"  [!] BASE層相転移! 本能的跳躍（パニック、逃走）")
+                if is_critical_core:
+                    print(f"  [!] CORE層相転移! 規範的跳躍（ルール破壊）")
+                if is_critical_upper:
+                    print(f"  [!] UPPER層相転移! 理念的跳躍（革命、メタ戦略）")
             
-            if new_state.is_critical_upper:
-                print(f"  [!] UPPER層相転移! 理念的跳躍（革命、メタ戦略）")
-                player.upper_ideological_leaps += 1
-                self.total_upper_leaps += 1
-            
-            player.state = new_state
             player.statement_count += 1
-            player.suspicion_level += random.uniform(-0.5, 1.0)
+            player.suspicion_level += suspicion_noise[k]
             player.suspicion_level = max(0.0, player.suspicion_level)
             
-            print(f"\n  最終エネルギー:")
-            print(f"    E_base={player.state.E_base:.1f}, "
-                  f"E_core={player.state.E_core:.1f}, "
-                  f"E_upper={player.state.E_upper:.1f}")
-            print(f"  整合慣性:")
-            print(f"    κ_base={player.state.kappa_base:.2f}, "
-                  f"κ_core={player.state.kappa_core:.2f}, "
-                  f"κ_upper={player.state.kappa_upper:.2f}")
+            if verbose:
+                print(f"\n  最終エネルギー:")
+                print(f"    E_base={player.state.E_base:.1f}, "
+                      f"E_core={player.state.E_core:.1f}, "
+                      f"E_upper={player.state.E_upper:.1f}")
+                print(f"  整合慣性:")
+                print(f"    κ_base={player.state.kappa_base:.2f}, "
+                      f"κ_core={player.state.kappa_core:.2f}, "
+                      f"κ_upper={player.state.kappa_upper:.2f}")
     
     def print_final_statistics(self):
         """最終統計（v8版）"""
@@ -520,27 +557,38 @@ class WerewolfGameV8:
         
         print(f"\n[システム全体]")
         print(f"  総ターン数: {self.day}")
-        print(f"  BASE層跳躍: {self.total_base_leaps}回 （本能的）")
-        print(f"  CORE層跳躍: {self.total_core_leaps}回 （規範的）")
-        print(f"  UPPER層跳躍: {self.total_upper_leaps}回 （理念的）")
+        total_base, total_core, total_upper = self.total_leaps.tolist()
+        print(f"  BASE層跳躍: {total_base}回 （本能的）")
+        print(f"  CORE層跳躍: {total_core}回 （規範的）")
+        print(f"  UPPER層跳躍: {total_upper}回 （理念的）")
+        
+        # [v8] 層別エネルギー（列: DIRECT, BASE, CORE, UPPER）から支配的不満層と分布を一括計算
+        E = np.array([(p.state.E_direct, p.state.E_base, p.state.E_core, p.state.E_upper)
+                      for p in self.players], dtype=float).reshape(-1, 4)
+        total = E[:, 0] + E[:, 1] + E[:, 2] + E[:, 3]
+        dominant_idx = E[:, 1:].argmax(axis=1).tolist()
+        distribution = np.divide(E, total[:, None], out=np.zeros_like(E), where=total[:, None] != 0).tolist()
+        E = E.tolist()
+        leap_counts = self.leap_counts.tolist()
         
         print(f"\n[プレイヤー別統計]")
-        for p in self.players:
+        for k, p in enumerate(self.players):
             print(f"\n  {p.name} ({p.role} / {p.persona.value}):")
             print(f"    発言: {p.statement_count}回")
             print(f"    戦略: {len(p.strategies_used)}回")
-            print(f"    BASE跳躍: {p.base_instinct_leaps}回")
-            print(f"    CORE跳躍: {p.core_normative_leaps}回")
-            print(f"    UPPER跳躍: {p.upper_ideological_leaps}回")
+            base_leaps, core_leaps, upper_leaps = leap_counts[self.name_to_idx[p.name]]
+            print(f"    BASE跳躍: {base_leaps}回")
+            print(f"    CORE跳躍: {core_leaps}回")
+            print(f"    UPPER跳躍: {upper_leaps}回")
             
             # [v8] 支配的不満層
-            dominant_frustration = p.engine.get_dominant_frustration_layer(p.state)
-            print(f"    支配的不満層: {dominant_frustration[0]} ({dominant_frustration[1]:.1f})")
+            d = dominant_idx[k]
+            print(f"    支配的不満層: {_POWER_LAYERS[d]} ({E[k][d + 1]:.1f})")
             
             # [v8] エネルギー分布
-            distribution = p.engine.get_layer_energy_distribution(p.state)
+            direct, base, core, upper = distribution[k]
             print(f"    エネルギー分布:")
-            for layer, ratio in distribution.items():
+            for layer, ratio in (('BASE', base), ('CORE', core), ('UPPER', upper), ('DIRECT', direct)):
                 print(f"      {layer}: {ratio*100:.1f}%")
 
 
@@ -0,0 +1,63 @@
+"""
+ssd_werewolf_game_v8 の層別圧力の回帰テスト
+
+v8は次元をssd_core_engine_v4.SSDLayerで指定していたため、多次元意味圧v2側で
+層が解決できず全層の圧力が0になっていた。
+"""
+
+import contextlib
+import io
+import random
+
+import numpy as np
+import pytest
+
+import ssd_core_engine_v4
+from ssd_multidimensional_pressure_v2 import MultiDimensionalPressure, SSDLayer
+from ssd_werewolf_game_v8 import WerewolfGameV8
+
+
+def _play_one_day(seed: int = 0) -> WerewolfGameV8:
+    random.seed(seed)
+    np.random.seed(seed)
+    game = WerewolfGameV8(verbosity=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        game.setup_game()
+        game.run_day_phase()
+    return game
+
+
+def test_day_produces_nonzero_layer_pressures():
+    game = _play_one_day()
+    for player in game.players:
+        history = player.pressure_system.layer_pressure_history
+        # 1日目: CORE=信頼システム圧力, UPPER=戦略的物語・理念圧力が必ず正
+        assert history[SSDLayer.CORE][-1] > 0.0
+        assert history[SSDLayer.UPPER][-1] > 0.0
+        # 層別圧力がv4.0エンジンまで届いている
+        assert player.state.p_core[0] == history[SSDLayer.CORE][-1]
+        assert player.state.p_upper[0] == history[SSDLayer.UPPER][-1]
+
+
+def test_foreign_layer_enum_resolved_by_name():
+    system = MultiDimensionalPressure()
+    system.register_dimension("x", calculator=None, layer=ssd_core_engine_v4.SSDLayer.BASE)
+    assert system.dimensions["x"].layer is SSDLayer.BASE
+    pressures = system.calculate_from_values(np.array([0.5]))
+    assert pressures[SSDLayer.BASE] == 0.5
+
+
+def test_unknown_layer_rejected():
+    system = MultiDimensionalPressure()
+    with pytest.raises(ValueError):
+        system.register_dimension("x", calculator=None, layer="BASE")
+
+
+def test_value_only_dimension_skipped_by_calculate():
+    system = MultiDimensionalPressure()
+    system.register_dimension("fixed", calculator=None, layer=SSDLayer.BASE)
+    system.register_dimension("ctx", calculator=lambda c: c["v"], layer=SSDLayer.CORE)
+    pressures = system.calculate({"v": 0.25})
+    assert pressures[SSDLayer.BASE] == 0.0
+    assert pressures[SSDLayer.CORE] == 0.25
+    assert system.dimensions["fixed"].history == []